@@ -1,46 +1,88 @@
-import base64
 import binascii
 import logging
+import os
 import time
-from threading import Lock
+from queue import Full
+from threading import BoundedSemaphore, Lock
 from typing import Any, Dict, Optional
 
+import pybase64
 from flask import Flask, Request, Response, jsonify, redirect, request, session, stream_with_context, url_for
 from flask_cors import CORS
+from waitress import serve
 
 from attendance_service import AttendanceService
+from batcher import DynamicBatcher
 from config import AppConfig
 from faculty_db import FacultyDB
+from json_provider import OrjsonProvider
 from recognition_service import build_default_recognition_service
 from registration import create_registration_blueprint
+from response_cache import VersionedResponseCache
 from routes.auth import create_auth_blueprint
 from routes.dashboard import create_dashboard_blueprint
 from stream_state import StreamState
 from student_db import StudentDB
-from utils import configure_logging
+from utils import configure_logging, migrate_legacy_data_dir, strip_data_uri_prefix
 
-# Thread-safe device mode for ESP32 polling/control.
-current_mode = "idle"
+# Device mode for ESP32 polling/control. Writers serialize on mode_lock; readers
+# load the single list slot without locking, which is atomic under the GIL.
+current_mode_ref = ["idle"]
 mode_lock = Lock()
-ALLOWED_MODES = {"idle", "register", "attendance"}
+ALLOWED_MODES = frozenset({"idle", "register", "attendance"})
 
 
 def create_app() -> Flask:
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     app.secret_key = AppConfig.FLASK_SECRET_KEY
     app.url_map.strict_slashes = False
 
     CORS(app, supports_credentials=True)
     configure_logging(AppConfig.LOG_LEVEL)
+    migrate_legacy_data_dir(
+        AppConfig.LEGACY_DATA_DIR,
+        AppConfig.DATA_DIR,
+        file_names=[os.path.basename(path) for path in (
+            AppConfig.STUDENTS_LEGACY_JSON, AppConfig.ATTENDANCE_JSON, AppConfig.FACULTY_DB_PATH,
+        )],
+        runtime_files=[os.path.basename(path) for path in (
+            AppConfig.STUDENTS_DB_PATH, AppConfig.ATTENDANCE_DB_PATH,
+        )],
+    )
 
-    student_db = StudentDB(AppConfig.STUDENTS_DB_PATH)
-    faculty_db = FacultyDB(AppConfig.FACULTY_DB_PATH)
+    student_db = StudentDB(AppConfig.STUDENTS_DB_PATH, legacy_json_path=AppConfig.STUDENTS_LEGACY_JSON)
+    faculty_db = FacultyDB(
+        AppConfig.FACULTY_DB_PATH,
+        kdf_workers=AppConfig.PASSWORD_HASH_WORKERS,
+        hash_method=AppConfig.PASSWORD_HASH_METHOD,
+    )
     faculty_db.ensure_default_user(AppConfig.FACULTY_USERNAME, AppConfig.FACULTY_PASSWORD)
     recognition_service = build_default_recognition_service(student_db)
+    if AppConfig.RECOGNITION_WARMUP:
+        recognition_service.warm_up()
+    if recognition_service.batches_detection:
+        batch_size = AppConfig.RECOGNITION_BATCH_SIZE
+        batch_delay_seconds = AppConfig.RECOGNITION_BATCH_MAX_DELAY_MS / 1000.0
+        batch_workers = 1
+    else:
+        # HOG detects frame by frame, so batching would only serialise frames behind one
+        # thread: every admitted frame gets its own worker and is dispatched immediately.
+        batch_size, batch_delay_seconds, batch_workers = 1, 0.0, AppConfig.RECOGNITION_QUEUE_CAPACITY
+    recognition_batcher = DynamicBatcher(
+        recognition_service.recognize_batch,
+        max_batch_size=batch_size,
+        max_delay_seconds=batch_delay_seconds,
+        max_pending=AppConfig.RECOGNITION_QUEUE_CAPACITY,
+        name="recognition-batcher",
+        workers=batch_workers,
+    )
     attendance_service = AttendanceService(
-        json_path=AppConfig.ATTENDANCE_JSON,
+        db_path=AppConfig.ATTENDANCE_DB_PATH,
         cooldown_seconds=AppConfig.COOLDOWN_SECONDS,
+        legacy_json_path=AppConfig.ATTENDANCE_JSON,
     )
+    response_cache = VersionedResponseCache()
     stream_state = StreamState(disconnect_timeout_seconds=AppConfig.ESP32_DISCONNECT_TIMEOUT_SECONDS)
     frame_counter = 0
     frame_counter_lock = Lock()
@@ -72,14 +114,14 @@ def create_app() -> Flask:
 
     @app.get("/health")
     def health_check():
-        with mode_lock:
-            mode = current_mode
+        mode = current_mode_ref[0]
         return (
             jsonify(
                 {
                     "status": "ok",
                     "service": "smartvision-backend",
                     "mode": mode,
+                    "recognition": recognition_batcher.stats(),
                 }
             ),
             200,
@@ -87,13 +129,11 @@ def create_app() -> Flask:
 
     @app.get("/device_mode")
     def device_mode():
-        with mode_lock:
-            mode = current_mode
-        return jsonify({"status": "ok", "mode": mode}), 200
+        return jsonify({"status": "ok", "mode": current_mode_ref[0]}), 200
 
     @app.get("/set_mode/<mode>")
     def set_mode(mode: str):
-        normalized_mode = str(mode or "").strip().lower()
+        normalized_mode = mode.strip().lower()
         if normalized_mode not in ALLOWED_MODES:
             return _json_error(
                 400,
@@ -102,18 +142,26 @@ def create_app() -> Flask:
             )
 
         with mode_lock:
-            global current_mode
-            current_mode = normalized_mode
+            current_mode_ref[0] = normalized_mode
 
         return jsonify({"status": "ok", "mode": normalized_mode}), 200
 
+    def cached_json_response(key, build_payload):
+        # Dashboard polls hit this far more often than attendance changes, so the
+        # serialized body is reused until AttendanceService reports a new write.
+        version = attendance_service.data_version
+        body = response_cache.get_or_build(key, version, lambda: app.json.dumps_bytes(build_payload()))
+        return Response(body, mimetype="application/json")
+
     @app.get("/api/attendance")
     def get_attendance():
         target_date = request.args.get("date")
         try:
-            records = attendance_service.get_records(target_date)
             selected_date = target_date or attendance_service.get_active_date()
-            return jsonify({"status": "ok", "date": selected_date, "records": records}), 200
+            return cached_json_response(
+                ("attendance", selected_date),
+                lambda: {"status": "ok", "date": selected_date, "records": attendance_service.get_records(selected_date)},
+            ), 200
         except ValueError as exc:
             return _json_error(400, "invalid_date", str(exc))
         except Exception as exc:
@@ -140,9 +188,11 @@ def create_app() -> Flask:
     def get_summary():
         target_date = request.args.get("date")
         try:
-            summary = attendance_service.get_summary(target_date)
-            summary["status"] = "ok"
-            return jsonify(summary), 200
+            selected_date = target_date or attendance_service.get_active_date()
+            return cached_json_response(
+                ("summary", selected_date),
+                lambda: {**attendance_service.get_summary(selected_date), "status": "ok"},
+            ), 200
         except ValueError as exc:
             return _json_error(400, "invalid_date", str(exc))
         except Exception as exc:
@@ -167,6 +217,11 @@ def create_app() -> Flask:
     @app.post("/upload")
     def recognize_face():
         nonlocal frame_counter
+        mode = current_mode_ref[0]
+        if mode == "idle":
+            # Misrouted frames while idle are dropped before any decode or inference work.
+            return jsonify({"status": "idle", "recognized": False, "mode": mode}), 200
+
         try:
             image_bytes = _extract_image_bytes_from_request(request)
             if image_bytes is None:
@@ -187,7 +242,18 @@ def create_app() -> Flask:
                 if not should_process:
                     return jsonify({"status": "skipped", "recognized": False, "message": "Frame skipped for performance."}), 200
 
-            result = recognition_service.recognize(image_bytes)
+            try:
+                pending_result = recognition_batcher.submit(image_bytes)
+            except Full:
+                response, status_code = _json_error(
+                    503,
+                    "overloaded",
+                    "Recognition queue is full. Retry shortly.",
+                )
+                response.headers["Retry-After"] = "1"
+                return response, status_code
+
+            result = pending_result.result()
             result_status = str(result.get("status", "error"))
 
             if result_status == "no_face":
@@ -245,9 +311,6 @@ def create_app() -> Flask:
                 target_date=target_date,
             )
 
-            with mode_lock:
-                mode = current_mode
-
             payload = {
                 "status": "present",
                 "recognized": True,
@@ -295,12 +358,20 @@ def create_app() -> Flask:
             return _json_error(404, "frame_unavailable", "No frame received from ESP32 yet.")
         return Response(frame, mimetype="image/jpeg")
 
+    video_stream_slots = BoundedSemaphore(AppConfig.VIDEO_STREAM_LIMIT) if AppConfig.VIDEO_STREAM_LIMIT else None
+
     @app.get("/video_feed")
     def video_feed():
-        return Response(
+        # A stream never ends on its own and pins a server thread, so the number of open
+        # streams is capped to the threads reserved for them in serve().
+        if video_stream_slots is None or not video_stream_slots.acquire(blocking=False):
+            return _json_error(503, "stream_limit", "Too many open video streams.")
+        response = Response(
             stream_with_context(_mjpeg_stream_generator(stream_state)),
             mimetype="multipart/x-mixed-replace; boundary=frame",
         )
+        response.call_on_close(video_stream_slots.release)
+        return response
 
     @app.errorhandler(404)
     def not_found(_error):
@@ -318,18 +389,26 @@ def create_app() -> Flask:
 
 
 def _extract_image_bytes_from_request(req: Request) -> Optional[bytes]:
+    # Dispatch on mimetype so each body is parsed at most once.
     # Preferred path: JSON base64 payload from ESP32.
-    payload = req.get_json(silent=True)
-    if isinstance(payload, dict):
+    if req.is_json:
+        payload = req.get_json(silent=True, cache=False)
+        if not isinstance(payload, dict):
+            return None
+
         encoded = payload.get("image_base64")
-        if isinstance(encoded, str) and encoded.strip():
-            if "," in encoded:
-                encoded = encoded.split(",", 1)[1]
-            try:
-                decoded = base64.b64decode(encoded, validate=True)
-                return decoded if decoded else None
-            except (ValueError, binascii.Error):
-                return None
+        if not isinstance(encoded, str) or not encoded.strip():
+            return None
+        try:
+            decoded = pybase64.b64decode(strip_data_uri_prefix(encoded), validate=True)
+            return decoded if decoded else None
+        except (ValueError, binascii.Error):
+            return None
+
+    # Optional fallback: raw image bytes.
+    if (req.content_type or "").startswith("image/") or req.mimetype == "application/octet-stream":
+        raw = req.get_data(cache=False)
+        return raw if raw else None
 
     # Backward compatibility: multipart/form-data image upload.
     if req.files:
@@ -338,11 +417,6 @@ def _extract_image_bytes_from_request(req: Request) -> Optional[bytes]:
             raw = file.read()
             return raw if raw else None
 
-    # Optional fallback: raw image bytes.
-    if (req.content_type or "").startswith("image/") or req.mimetype == "application/octet-stream":
-        raw = req.get_data(cache=False)
-        return raw if raw else None
-
     return None
 
 
@@ -386,12 +460,11 @@ if __name__ == "__main__":
     host = AppConfig.HOST if AppConfig.HOST else "0.0.0.0"
     port = AppConfig.PORT if AppConfig.PORT else 5000
 
-    logging.info(f"Starting SmartVision Backend on {host}:{port}")
-
-    app.run(
-        host=host,
-        port=port,
-        debug=False,
-        threaded=True,
-        use_reloader=False  # Prevent double initialization issues
+    threads = AppConfig.SERVER_THREADS + AppConfig.VIDEO_STREAM_LIMIT
+    logging.info(
+        f"Starting SmartVision Backend on {host}:{port} with {AppConfig.SERVER_THREADS} request threads "
+        f"and {AppConfig.VIDEO_STREAM_LIMIT} video stream threads"
     )
+
+    # Single process so the model and face index load once; threads provide concurrency.
+    serve(app, host=host, port=port, threads=threads)
@@ -1,45 +1,112 @@
-import json
+import atexit
 import logging
 import os
+import queue
+import sqlite3
 import threading
 from datetime import date, datetime, timezone
 from typing import Dict, List, Optional, Tuple
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 from config import AppConfig
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS attendance (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    student_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    roll_number TEXT NOT NULL DEFAULT '',
+    department TEXT NOT NULL DEFAULT '',
+    entry_time TEXT NOT NULL DEFAULT '',
+    exit_time TEXT NOT NULL DEFAULT '',
+    confidence REAL NOT NULL DEFAULT 0,
+    entry_epoch REAL,
+    exit_epoch REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_attendance_date_student ON attendance (date, student_id, id);
+"""
+
+_RECORD_COLUMNS = "student_id, name, roll_number, department, entry_time, exit_time, confidence, date"
+
 
 class AttendanceService:
-    def __init__(self, json_path: str, cooldown_seconds: int) -> None:
-        self.json_path = json_path
+    def __init__(self, db_path: str, cooldown_seconds: int, legacy_json_path: Optional[str] = None) -> None:
+        self.db_path = db_path
+        self.legacy_json_path = legacy_json_path
         self.cooldown_seconds = cooldown_seconds
         self._lock = threading.Lock()
-        self._ensure_file()
-
-    def _ensure_file(self) -> None:
-        os.makedirs(os.path.dirname(self.json_path), exist_ok=True)
-        if not os.path.exists(self.json_path):
-            with self._lock:
-                with open(self.json_path, "w", encoding="utf-8") as file:
-                    json.dump({"active_date": None, "records_by_date": {}}, file, indent=2)
+        self._data_version = 0
+        self._settings_cache: Optional[Dict[str, str]] = None
+        self._settings_db_version: Optional[int] = None
+        self._last_records_date: Optional[str] = None
+        self._last_records_db_version: Optional[int] = None
+        self._last_records: Dict[int, Optional[Dict]] = {}
+        self._conn = self._connect()
+        self._readers = threading.local()
+        self._http = requests.Session()
+        self._http.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self._buzzer_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._buzzer_worker = threading.Thread(target=self._run_buzzer_worker, name="buzzer-notifier", daemon=True)
+        self._buzzer_worker.start()
+        atexit.register(self.close)
+
+    @property
+    def data_version(self) -> int:
+        return self._data_version
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        is_new_db = not os.path.exists(self.db_path)
+
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL skips the fsync on every commit and syncs at checkpoints instead;
+        # a power cut can lose the last few marks but cannot corrupt the database.
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            conn.executescript(_SCHEMA)
+        self._ensure_epoch_columns(conn)
+
+        if is_new_db and self.legacy_json_path and os.path.exists(self.legacy_json_path):
+            self._import_legacy_json(conn, self.legacy_json_path)
+
+        return conn
+
+    def _read_connection(self) -> sqlite3.Connection:
+        # WAL lets readers run alongside the writer, so record reads use one connection per
+        # thread and never queue behind mark_attendance on self._lock.
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only=ON")
+            self._readers.conn = conn
+        return conn
 
     def set_active_date(self, target_date: str) -> str:
         self._validate_date(target_date)
 
         with self._lock:
-            payload = self._read_unsafe()
-            payload["active_date"] = target_date
-            payload.setdefault("records_by_date", {})
-            payload["records_by_date"].setdefault(target_date, [])
-            self._write_unsafe(payload)
+            with self._conn:
+                self._set_setting_unsafe("active_date", target_date)
+            self._data_version += 1
 
         return target_date
 
     def get_active_date(self) -> str:
         with self._lock:
-            payload = self._read_unsafe()
-            active_date = payload.get("active_date")
+            active_date = self._get_setting_unsafe("active_date")
 
         if active_date:
             return active_date
@@ -48,65 +115,79 @@ class AttendanceService:
 
     def mark_attendance(self, student: Dict, confidence: float, target_date: Optional[str] = None) -> Dict:
         now = datetime.now(timezone.utc)
+        now_epoch = now.timestamp()
         current_date = target_date or self.get_active_date()
         self._validate_date(current_date)
         self.log_attempt("recognized", student_id=student.get("id"), name=student.get("name"), confidence=confidence)
 
         with self._lock:
-            payload = self._read_unsafe()
-            records_by_date = payload.setdefault("records_by_date", {})
-            day_records = records_by_date.setdefault(current_date, [])
-            last_record = self._get_last_record_for_student(day_records, int(student["id"]))
-
-            if last_record is not None:
-                last_ts = self._latest_timestamp(last_record)
-                if last_ts and (now - last_ts).total_seconds() < self.cooldown_seconds:
-                    self._notify_buzzer("cooldown")
-                    logging.info("Cooldown attendance blocked for student_id=%s", student.get("id"))
-                    return {
-                        "status": "cooldown",
-                        "student_id": student["id"],
-                        "name": student["name"],
-                        "confidence": confidence,
-                        "message": "Cooldown active.",
-                        "date": current_date,
+            with self._conn:
+                last_record = self._get_cached_last_record_unsafe(current_date, int(student["id"]))
+
+                if last_record is not None:
+                    last_epoch = self._latest_epoch(last_record)
+                    if last_epoch is not None and now_epoch - last_epoch < self.cooldown_seconds:
+                        self._notify_buzzer("cooldown")
+                        logging.info("Cooldown attendance blocked for student_id=%s", student.get("id"))
+                        return {
+                            "status": "cooldown",
+                            "student_id": student["id"],
+                            "name": student["name"],
+                            "confidence": confidence,
+                            "message": "Cooldown active.",
+                            "date": current_date,
+                        }
+
+                if last_record and not last_record.get("exit_time"):
+                    status = "exit"
+                    self._conn.execute(
+                        "UPDATE attendance SET exit_time = ?, exit_epoch = ? WHERE id = ?",
+                        (now.isoformat(), now_epoch, last_record["id"]),
+                    )
+                    self._last_records[int(student["id"])] = {
+                        **last_record,
+                        "exit_time": now.isoformat(),
+                        "exit_epoch": now_epoch,
+                    }
+                else:
+                    status = "entry"
+                    cursor = self._conn.execute(
+                        """
+                        INSERT INTO attendance (
+                            date, student_id, name, roll_number, department, entry_time, exit_time, confidence, entry_epoch
+                        )
+                        VALUES (?, ?, ?, ?, ?, ?, '', ?, ?)
+                        """,
+                        (
+                            current_date,
+                            int(student["id"]),
+                            student["name"],
+                            student["roll_number"],
+                            student["department"],
+                            now.isoformat(),
+                            round(float(confidence), 2),
+                            now_epoch,
+                        ),
+                    )
+                    self._last_records[int(student["id"])] = {
+                        "id": cursor.lastrowid,
+                        "entry_time": now.isoformat(),
+                        "exit_time": "",
+                        "entry_epoch": now_epoch,
+                        "exit_epoch": None,
                     }
 
-            if last_record and not last_record.get("exit_time"):
-                last_record["exit_time"] = now.isoformat()
-                self._write_unsafe(payload)
-                self._notify_buzzer("exit")
-                logging.info("Exit marked for student_id=%s date=%s", student.get("id"), current_date)
-                return {
-                    "status": "exit",
-                    "student_id": student["id"],
-                    "name": student["name"],
-                    "confidence": confidence,
-                    "timestamp": now.isoformat(),
-                    "date": current_date,
-                }
-
-            new_entry = {
-                "student_id": student["id"],
-                "name": student["name"],
-                "roll_number": student["roll_number"],
-                "department": student["department"],
-                "entry_time": now.isoformat(),
-                "exit_time": "",
-                "confidence": round(float(confidence), 2),
-                "date": current_date,
-            }
-            day_records.append(new_entry)
-
-            if not payload.get("active_date"):
-                payload["active_date"] = current_date
+                    if not self._get_setting_unsafe("active_date"):
+                        self._set_setting_unsafe("active_date", current_date)
 
-            self._write_unsafe(payload)
+            # Bumped only after the commit: record reads skip self._lock, so a poll that sees
+            # the new version is guaranteed to also see the committed rows.
+            self._data_version += 1
 
-        self._notify_buzzer("entry")
-        logging.info("Entry marked for student_id=%s date=%s", student.get("id"), current_date)
+        self._notify_buzzer(status)
+        logging.info("%s marked for student_id=%s date=%s", status.capitalize(), student.get("id"), current_date)
         return {
-            "status": "entry",
+            "status": status,
             "student_id": student["id"],
             "name": student["name"],
             "confidence": confidence,
@@ -131,26 +212,37 @@ class AttendanceService:
         logging.error("Recognition error: %s", message)
 
     def trigger_buzzer(self, pattern: str) -> Tuple[bool, str]:
-        return self._notify_buzzer(pattern)
+        return self._send_buzzer(pattern)
 
     def get_records(self, target_date: Optional[str] = None) -> List[Dict]:
         current_date = target_date or self.get_active_date()
         self._validate_date(current_date)
 
-        with self._lock:
-            payload = self._read_unsafe()
-            day_records = payload.get("records_by_date", {}).get(current_date, [])
+        rows = self._read_connection().execute(
+            f"SELECT {_RECORD_COLUMNS} FROM attendance WHERE date = ? ORDER BY id",
+            (current_date,),
+        ).fetchall()
 
-        return day_records
+        return [dict(row) for row in rows]
 
     def get_summary(self, target_date: Optional[str] = None) -> Dict:
         current_date = target_date or self.get_active_date()
         self._validate_date(current_date)
-        records = self.get_records(current_date)
-
-        total_entries = len(records)
-        total_exits = sum(1 for record in records if record.get("exit_time"))
-        present = sorted({record["name"] for record in records if not record.get("exit_time")})
+        conn = self._read_connection()
+
+        # Aggregated in SQLite so only the counts and the present names reach Python.
+        totals = conn.execute(
+            "SELECT COUNT(*), COUNT(NULLIF(exit_time, '')) FROM attendance WHERE date = ?",
+            (current_date,),
+        ).fetchone()
+        total_entries, total_exits = int(totals[0]), int(totals[1])
+        present = [
+            row[0]
+            for row in conn.execute(
+                "SELECT DISTINCT name FROM attendance WHERE date = ? AND exit_time = '' ORDER BY name",
+                (current_date,),
+            )
+        ]
 
         return {
             "date": current_date,
@@ -160,10 +252,28 @@ class AttendanceService:
             "present": present,
         }
 
-    def _notify_buzzer(self, pattern: str) -> Tuple[bool, str]:
+    def _notify_buzzer(self, pattern: str) -> None:
+        # Fire-and-forget: recognition responses must not wait on the ESP32 round trip.
+        self._buzzer_queue.put_nowait(pattern)
+
+    def close(self, timeout: float = 3.0) -> None:
+        # Lets queued buzzer notifications go out before the interpreter tears down the
+        # daemon worker; the None sentinel stops it once the backlog is sent.
+        if self._buzzer_worker.is_alive():
+            self._buzzer_queue.put_nowait(None)
+            self._buzzer_worker.join(timeout=timeout)
+
+    def _run_buzzer_worker(self) -> None:
+        while True:
+            pattern = self._buzzer_queue.get()
+            if pattern is None:
+                return
+            self._send_buzzer(pattern)
+
+    def _send_buzzer(self, pattern: str) -> Tuple[bool, str]:
         try:
             url = f"{AppConfig.ESP32_BASE_URL}/buzzer"
-            response = requests.post(url, json={"pattern": pattern}, timeout=2)
+            response = self._http.post(url, json={"pattern": pattern}, timeout=2)
 
             if response.ok:
                 return True, "Buzzer triggered."
@@ -180,49 +290,148 @@ class AttendanceService:
         except ValueError as exc:
             raise ValueError("Date must be in YYYY-MM-DD format.") from exc
 
+    def _get_cached_last_record_unsafe(self, current_date: str, student_id: int) -> Optional[Dict]:
+        # Last row per student for the date being marked; dropped when the date changes or
+        # another connection commits, and written through by mark_attendance otherwise.
+        db_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if current_date != self._last_records_date or db_version != self._last_records_db_version:
+            self._last_records = {}
+            self._last_records_date = current_date
+            self._last_records_db_version = db_version
+
+        if student_id not in self._last_records:
+            self._last_records[student_id] = self._get_last_record_for_student(self._conn, current_date, student_id)
+        return self._last_records[student_id]
+
     @staticmethod
-    def _get_last_record_for_student(records: List[Dict], student_id: int) -> Optional[Dict]:
-        for record in reversed(records):
-            if int(record.get("student_id", -1)) == int(student_id):
-                return record
-        return None
+    def _get_last_record_for_student(conn: sqlite3.Connection, current_date: str, student_id: int) -> Optional[Dict]:
+        row = conn.execute(
+            """
+            SELECT id, entry_time, exit_time, entry_epoch, exit_epoch
+            FROM attendance WHERE date = ? AND student_id = ? ORDER BY id DESC LIMIT 1
+            """,
+            (current_date, int(student_id)),
+        ).fetchone()
+        return dict(row) if row is not None else None
 
     @staticmethod
-    def _latest_timestamp(record: Dict) -> Optional[datetime]:
-        if record.get("exit_time"):
-            try:
-                return datetime.fromisoformat(record["exit_time"])
-            except ValueError:
-                logging.warning("Invalid exit_time found in attendance record")
-        if record.get("entry_time"):
-            try:
-                return datetime.fromisoformat(record["entry_time"])
-            except ValueError:
-                logging.warning("Invalid entry_time found in attendance record")
+    def _latest_epoch(record: Dict) -> Optional[float]:
+        for time_key, epoch_key in (("exit_time", "exit_epoch"), ("entry_time", "entry_epoch")):
+            if not record.get(time_key):
+                continue
+            if record.get(epoch_key) is not None:
+                return float(record[epoch_key])
+
+            # Rows written before epoch columns existed fall back to parsing the ISO string.
+            epoch = AttendanceService._iso_to_epoch(record[time_key])
+            if epoch is not None:
+                return epoch
+            logging.warning("Invalid %s found in attendance record", time_key)
         return None
 
-    def _read_unsafe(self) -> Dict:
+    @staticmethod
+    def _iso_to_epoch(value: str) -> Optional[float]:
+        if not value:
+            return None
         try:
-            with open(self.json_path, "r", encoding="utf-8") as file:
-                payload = json.load(file)
-
-            if isinstance(payload, list):
-                migrated = {
-                    "active_date": date.today().isoformat(),
-                    "records_by_date": {date.today().isoformat(): payload},
-                }
-                return migrated
-
-            if isinstance(payload, dict):
-                payload.setdefault("active_date", None)
-                payload.setdefault("records_by_date", {})
-                return payload
-
-        except (json.JSONDecodeError, FileNotFoundError):
-            pass
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return None
 
-        return {"active_date": None, "records_by_date": {}}
+    @staticmethod
+    def _ensure_epoch_columns(conn: sqlite3.Connection) -> None:
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(attendance)")}
+        if {"entry_epoch", "exit_epoch"} <= columns:
+            return
+
+        with conn:
+            for column in ("entry_epoch", "exit_epoch"):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE attendance ADD COLUMN {column} REAL")
+
+            rows = conn.execute("SELECT id, entry_time, exit_time FROM attendance").fetchall()
+            conn.executemany(
+                "UPDATE attendance SET entry_epoch = ?, exit_epoch = ? WHERE id = ?",
+                [
+                    (
+                        AttendanceService._iso_to_epoch(row["entry_time"]),
+                        AttendanceService._iso_to_epoch(row["exit_time"]),
+                        row["id"],
+                    )
+                    for row in rows
+                ],
+            )
+
+    def _get_setting_unsafe(self, key: str) -> Optional[str]:
+        # PRAGMA data_version only moves when another connection commits, so the cached
+        # settings survive our own writes and are reloaded after external edits.
+        db_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._settings_cache is None or db_version != self._settings_db_version:
+            rows = self._conn.execute("SELECT key, value FROM settings").fetchall()
+            self._settings_cache = {row["key"]: row["value"] for row in rows}
+            self._settings_db_version = db_version
+        return self._settings_cache.get(key)
+
+    def _set_setting_unsafe(self, key: str, value: str) -> None:
+        self._conn.execute(
+            "INSERT INTO settings (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+        if self._settings_cache is not None:
+            self._settings_cache[key] = value
 
-    def _write_unsafe(self, payload: Dict) -> None:
-        with open(self.json_path, "w", encoding="utf-8") as file:
-            json.dump(payload, file, indent=2, ensure_ascii=False)
+    @staticmethod
+    def _import_legacy_json(conn: sqlite3.Connection, json_path: str) -> None:
+        try:
+            with open(json_path, "rb") as file:
+                payload = orjson.loads(file.read())
+        except (orjson.JSONDecodeError, OSError) as exc:
+            logging.warning("Skipping legacy attendance import from %s: %s", json_path, exc)
+            return
+
+        if isinstance(payload, list):
+            payload = {
+                "active_date": date.today().isoformat(),
+                "records_by_date": {date.today().isoformat(): payload},
+            }
+        if not isinstance(payload, dict):
+            return
+
+        rows = []
+        for record_date, records in (payload.get("records_by_date") or {}).items():
+            for record in records or []:
+                entry_time = str(record.get("entry_time", "") or "")
+                exit_time = str(record.get("exit_time", "") or "")
+                rows.append(
+                    (
+                        record_date,
+                        int(record.get("student_id", -1)),
+                        str(record.get("name", "")),
+                        str(record.get("roll_number", "")),
+                        str(record.get("department", "")),
+                        entry_time,
+                        exit_time,
+                        float(record.get("confidence", 0.0) or 0.0),
+                        AttendanceService._iso_to_epoch(entry_time),
+                        AttendanceService._iso_to_epoch(exit_time),
+                    )
+                )
+
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO attendance (
+                    date, student_id, name, roll_number, department, entry_time, exit_time, confidence,
+                    entry_epoch, exit_epoch
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            if payload.get("active_date"):
+                conn.execute(
+                    "INSERT OR REPLACE INTO settings (key, value) VALUES ('active_date', ?)",
+                    (payload["active_date"],),
+                )
+
+        logging.info("Imported %d attendance records from %s", len(rows), json_path)
@@ -1 +0,0 @@
-"""Backend package for SmartVision Attendance System."""
\ No newline at end of file
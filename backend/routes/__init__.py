@@ -1 +0,0 @@
-"""Route blueprints for SmartVision Flask app."""
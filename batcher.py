@@ -0,0 +1,107 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from queue import Empty, Full, Queue
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class DynamicBatcher:
+    def __init__(
+        self,
+        handler: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int,
+        max_delay_seconds: float,
+        max_pending: int = 0,
+        name: str = "dynamic-batcher",
+        workers: int = 1,
+    ) -> None:
+        self._handler = handler
+        self._max_batch_size = max(1, int(max_batch_size))
+        self._max_delay_seconds = max(0.0, float(max_delay_seconds))
+        self._queue: "Queue[Tuple[Any, Future]]" = Queue()
+        # Counts items from submit until their future resolves, queued or in the running
+        # batch: each one is a request thread blocked on the result.
+        self._max_pending = max(0, int(max_pending))
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._inflight = 0
+        # Several workers only make sense with max_batch_size=1: frames then run side by
+        # side on their own threads instead of queueing behind one another.
+        self._workers = [
+            threading.Thread(target=self._run, name=f"{name}-{index}", daemon=True)
+            for index in range(max(1, int(workers)))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, item: Any) -> Future:
+        # Raises queue.Full instead of blocking so callers can shed load.
+        with self._pending_lock:
+            if self._max_pending and self._pending >= self._max_pending:
+                raise Full
+            self._pending += 1
+        future: Future = Future()
+        future.add_done_callback(self._release_pending)
+        self._queue.put_nowait((item, future))
+        return future
+
+    def _release_pending(self, _future: Future) -> None:
+        with self._pending_lock:
+            self._pending -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "pending": self._pending,
+            "max_pending": self._max_pending,
+            "inflight": self._inflight,
+            "max_batch_size": self._max_batch_size,
+            "workers": len(self._workers),
+        }
+
+    def process(self, item: Any, timeout: Optional[float] = None) -> Any:
+        return self.submit(item).result(timeout=timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            # Whatever is already queued joins the batch for free; waiting for more only
+            # happens when a delay is configured, so a lone frame is dispatched at once.
+            while len(batch) < self._max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Empty:
+                    break
+
+            deadline = time.monotonic() + self._max_delay_seconds
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except Empty:
+                    break
+
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[Any, Future]]) -> None:
+        items = [item for item, _ in batch]
+        with self._pending_lock:
+            self._inflight += len(batch)
+        try:
+            results = self._handler(items)
+            if len(results) != len(batch):
+                raise RuntimeError(f"Batch handler returned {len(results)} results for {len(batch)} items.")
+        except Exception as exc:
+            logging.exception("Batched handler failed for %d items", len(batch))
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        finally:
+            with self._pending_lock:
+                self._inflight -= len(batch)
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
@@ -3,7 +3,7 @@ import os
 from dotenv import load_dotenv
 
 
-BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 load_dotenv(os.path.join(BASE_DIR, ".env"))
 
 
@@ -52,23 +52,53 @@ def _get_str_env(key: str, default: str) -> str:
 class AppConfig:
     HOST = os.getenv("HOST", "0.0.0.0")
     PORT = _get_int_env("PORT", 5000)
+    # SERVER_THREADS serve normal requests. Each open /video_feed holds a thread for as long
+    # as the page stays open, so waitress gets VIDEO_STREAM_LIMIT extra threads on top and
+    # viewers beyond the limit get a 503 instead of starving login, API and recognition.
+    SERVER_THREADS = max(1, _get_int_env("SERVER_THREADS", 8))
+    VIDEO_STREAM_LIMIT = max(0, _get_int_env("VIDEO_STREAM_LIMIT", 4))
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
     BASE_DIR = BASE_DIR
-    BACKEND_DIR = os.path.join(BASE_DIR, "backend")
-    DATA_DIR = os.path.join(BACKEND_DIR, "data")
+    DATA_DIR = os.path.join(BASE_DIR, "data")
+    # Where the removed backend/ copy of the app kept its data; migrated into DATA_DIR on startup.
+    LEGACY_DATA_DIR = os.path.join(BASE_DIR, "backend", "data")
 
     FACULTY_DB_PATH = os.path.join(DATA_DIR, "faculty_users.json")
 
-    STUDENTS_DB_PATH = os.path.join(DATA_DIR, "students.json")
+    STUDENTS_DB_PATH = os.path.join(DATA_DIR, "students.jsonl")
+    STUDENTS_LEGACY_JSON = os.path.join(DATA_DIR, "students.json")
     ATTENDANCE_JSON = os.path.join(DATA_DIR, "attendance.json")
+    ATTENDANCE_DB_PATH = os.path.join(DATA_DIR, "attendance.db")
+
+    PASSWORD_HASH_WORKERS = max(1, _get_int_env("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+    PASSWORD_HASH_METHOD = _get_str_env("PASSWORD_HASH_METHOD", "")
 
     FACE_TOLERANCE = _get_float_env("FACE_TOLERANCE", 0.6)
+    # 0 keeps the NumPy block search exact, like the FAISS and Numba paths. A positive value
+    # lets large galleries stop at the first block with a match under it, which is faster but
+    # may return a close student from an earlier block instead of the nearest one.
+    FACE_STRONG_MATCH_DISTANCE = _get_float_env("FACE_STRONG_MATCH_DISTANCE", 0.0)
     FACE_DETECTION_MODEL = _get_str_env("FACE_DETECTION_MODEL", "hog").lower()
     FACE_ENCODING_MODEL = _get_str_env("FACE_ENCODING_MODEL", "small").lower()
     FACE_FRAME_RESIZE_SCALE = _get_float_env("FACE_FRAME_RESIZE_SCALE", 1.0)
+    FACE_FRAME_MAX_EDGE = max(0, _get_int_env("FACE_FRAME_MAX_EDGE", 640))
     FACE_USE_GRAYSCALE = _get_bool_env("FACE_USE_GRAYSCALE", False)
     RECOGNITION_FRAME_SKIP = max(1, _get_int_env("RECOGNITION_FRAME_SKIP", 2))
+    RECOGNITION_BATCH_SIZE = max(1, _get_int_env("RECOGNITION_BATCH_SIZE", 8))
+    # Batch size and delay only apply to the CNN detector; with HOG each frame runs alone.
+    RECOGNITION_BATCH_MAX_DELAY_MS = max(0, _get_int_env("RECOGNITION_BATCH_MAX_DELAY_MS", 5))
+    # Frames waiting on or inside a recognition batch, each holding a request thread. Kept
+    # below SERVER_THREADS so the 503 fires before recognition can occupy every thread.
+    RECOGNITION_QUEUE_CAPACITY = min(
+        max(1, _get_int_env("RECOGNITION_QUEUE_CAPACITY", SERVER_THREADS // 2)),
+        max(1, SERVER_THREADS - 1),
+    )
+    RECOGNITION_WARMUP = _get_bool_env("RECOGNITION_WARMUP", True)
+    # Like the recognition batch settings, these only apply to the CNN detector.
+    REGISTRATION_BATCH_SIZE = max(1, _get_int_env("REGISTRATION_BATCH_SIZE", 4))
+    REGISTRATION_BATCH_MAX_DELAY_MS = max(0, _get_int_env("REGISTRATION_BATCH_MAX_DELAY_MS", 5))
+    REGISTRATION_DETECTION_UPSAMPLE = max(0, _get_int_env("REGISTRATION_DETECTION_UPSAMPLE", 0))
     ESP32_DISCONNECT_TIMEOUT_SECONDS = _get_int_env("ESP32_DISCONNECT_TIMEOUT_SECONDS", 6)
     COOLDOWN_SECONDS = _get_int_env("COOLDOWN_SECONDS", 120)
     ESP32_BASE_URL = _get_str_env("ESP32_BASE_URL", "http://192.168.4.1")
@@ -0,0 +1,107 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+
+try:
+    import faiss
+except ImportError:  # faiss is optional; the NumPy path below is exact as well.
+    faiss = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; without it the fallback is a single BLAS matmul.
+    njit = None
+
+
+ENCODING_DIMENSION = 128
+SEARCH_BLOCK_ROWS = 256
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _fused_best_match(matrix, probes):
+        # One streaming pass per probe: subtract, square, sum and argmin fused, no (P, N) buffer.
+        best_indices = np.zeros(probes.shape[0], dtype=np.int64)
+        best_squared = np.full(probes.shape[0], np.inf, dtype=np.float32)
+        for p in prange(probes.shape[0]):
+            for i in range(matrix.shape[0]):
+                squared = np.float32(0.0)
+                for j in range(matrix.shape[1]):
+                    diff = matrix[i, j] - probes[p, j]
+                    squared += diff * diff
+                if squared < best_squared[p]:
+                    best_squared[p] = squared
+                    best_indices[p] = i
+        return best_indices, best_squared
+else:
+    _fused_best_match = None
+
+
+class FaceIndex:
+    def __init__(self, matrix: np.ndarray, student_ids: np.ndarray, strong_match_distance: float = 0.0) -> None:
+        # Row i of the (N, 128) float32 matrix belongs to student_ids[i]; student metadata
+        # stays outside the index and is only looked up for the winning row.
+        self._matrix = np.ascontiguousarray(matrix, dtype=np.float32).reshape(-1, ENCODING_DIMENSION)
+        self._student_ids = np.asarray(student_ids, dtype=np.int64)
+        if len(self._student_ids) != len(self._matrix):
+            raise ValueError("Encoding matrix and student id array must have the same length.")
+        self._index = None
+        self._strong_match_squared = max(0.0, float(strong_match_distance)) ** 2
+        self._squared_norms = np.einsum("ij,ij->i", self._matrix, self._matrix)
+
+        if faiss is not None and len(self._matrix):
+            # Flat L2 keeps FACE_TOLERANCE semantics: dlib encodings are not unit-norm,
+            # so an inner-product index would change which distances pass the threshold.
+            self._index = faiss.IndexFlatL2(ENCODING_DIMENSION)
+            self._index.add(self._matrix)
+
+    @classmethod
+    def empty(cls) -> "FaceIndex":
+        return cls(np.empty((0, ENCODING_DIMENSION), dtype=np.float32), np.empty(0, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return int(self._matrix.shape[0])
+
+    def search(self, probes: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        probe_matrix = np.ascontiguousarray(probes, dtype=np.float32).reshape(-1, ENCODING_DIMENSION)
+
+        if self._index is not None:
+            squared_distances, indices = self._index.search(probe_matrix, 1)
+            best_indices = indices[:, 0]
+            best_distances = np.sqrt(np.maximum(squared_distances[:, 0], 0.0))
+        elif _fused_best_match is not None:
+            best_indices, best_squared = _fused_best_match(self._matrix, probe_matrix)
+            best_distances = np.sqrt(best_squared)
+        else:
+            best_indices, best_squared = self._search_blocks(probe_matrix)
+            best_distances = np.sqrt(np.maximum(best_squared, 0.0))
+
+        return self._student_ids[best_indices], best_distances
+
+    def _search_blocks(self, probe_matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # ||e - q||^2 = ||e||^2 + ||q||^2 - 2 e.q, so each block is one BLAS matmul instead of
+        # a (P, N, 128) difference tensor. Exact by default (one pass over every row); with a
+        # strong_match_distance, probes stop at the first block holding a match under it,
+        # which is approximate once the gallery spans more than one block.
+        probe_norms = np.einsum("ij,ij->i", probe_matrix, probe_matrix)
+        best_indices = np.zeros(len(probe_matrix), dtype=np.int64)
+        best_squared = np.full(len(probe_matrix), np.inf, dtype=np.float32)
+        pending = np.arange(len(probe_matrix))
+        block_rows = SEARCH_BLOCK_ROWS if self._strong_match_squared else max(1, len(self._matrix))
+
+        for start in range(0, len(self._matrix), block_rows):
+            block = self._matrix[start:start + block_rows]
+            squared = self._squared_norms[None, start:start + block_rows] - 2.0 * (probe_matrix[pending] @ block.T)
+            squared += probe_norms[pending, None]
+
+            local_indices = np.argmin(squared, axis=1)
+            local_squared = squared[np.arange(len(pending)), local_indices]
+            improved = local_squared < best_squared[pending]
+            best_squared[pending[improved]] = local_squared[improved]
+            best_indices[pending[improved]] = start + local_indices[improved]
+
+            pending = pending[best_squared[pending] >= self._strong_match_squared]
+            if not len(pending):
+                break
+
+        return best_indices, best_squared
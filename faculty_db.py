@@ -1,24 +1,50 @@
-import json
+import hashlib
+import logging
 import os
+import ssl
 import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
+import orjson
 from werkzeug.security import check_password_hash, generate_password_hash
 
+from utils import ReadWriteLock, atomic_write
+
+_VERIFY_CACHE_TTL_SECONDS = 5.0
+_VERIFY_CACHE_MAX_ENTRIES = 256
+
 
 class FacultyDB:
-    def __init__(self, json_path: str) -> None:
+    def __init__(self, json_path: str, kdf_workers: Optional[int] = None, hash_method: Optional[str] = None) -> None:
         self.json_path = json_path
-        self._lock = threading.Lock()
+        # Werkzeug's scrypt and pbkdf2 methods run inside OpenSSL, which already picks
+        # SHA-NI/AVX code paths at runtime; the method only changes the stored hash format.
+        self.hash_method = hash_method or None
+        if self.hash_method:
+            generate_password_hash("", method=self.hash_method)
+        logging.info("Password hashing: %s via %s", self.hash_method or "werkzeug default", ssl.OPENSSL_VERSION)
+        # Password hashing is deliberately slow; a bounded pool caps how many cores a burst
+        # of logins can take from recognition, whatever the number of server threads.
+        self._kdf_executor = ThreadPoolExecutor(
+            max_workers=max(1, int(kdf_workers or os.cpu_count() or 2)),
+            thread_name_prefix="password-kdf",
+        )
+        self._lock = ReadWriteLock()
+        self._cache: Optional[Tuple[Tuple[int, int], Dict, Dict[str, Dict]]] = None
+        self._verify_lock = threading.Lock()
+        self._verify_cache: "OrderedDict[Tuple[str, str, bytes], float]" = OrderedDict()
+        self._verify_salt = os.urandom(16)
         self._ensure_file()
 
     def _ensure_file(self) -> None:
         os.makedirs(os.path.dirname(self.json_path), exist_ok=True)
         if not os.path.exists(self.json_path):
-            with self._lock:
-                with open(self.json_path, "w", encoding="utf-8") as file:
-                    json.dump({"next_id": 1, "users": []}, file, indent=2)
+            with self._lock.write_lock():
+                atomic_write(self.json_path, orjson.dumps({"next_id": 1, "users": []}, option=orjson.OPT_INDENT_2))
 
     def ensure_default_user(self, username: str, password: str) -> None:
         if not username or not password:
@@ -32,11 +58,14 @@ class FacultyDB:
         if not username or not password:
             raise ValueError("Username and password are required.")
 
-        with self._lock:
-            payload = self._read_unsafe()
+        # Hashed before taking the write lock so readers never wait on the KDF.
+        password_hash = self._hash_password(password)
+
+        with self._lock.write_lock():
+            payload, users_by_name = self._load_unsafe()
             users = payload.get("users", [])
 
-            if any(user["username"].lower() == username.lower() for user in users):
+            if username.lower() in users_by_name:
                 raise ValueError("Username already exists.")
 
             user_id = int(payload.get("next_id", 1))
@@ -44,7 +73,7 @@ class FacultyDB:
             user = {
                 "id": user_id,
                 "username": username,
-                "password_hash": generate_password_hash(password),
+                "password_hash": password_hash,
                 "is_admin": bool(is_admin),
                 "created_at": now_iso,
                 "updated_at": now_iso,
@@ -60,47 +89,105 @@ class FacultyDB:
         user = self.get_user(username)
         if not user:
             return False
-        return check_password_hash(user["password_hash"], password)
+
+        # Only successful checks are remembered, and the key includes the stored hash, so a
+        # password change or a wrong guess always goes through the full KDF.
+        digest = hashlib.sha256(self._verify_salt + password.encode("utf-8")).digest()
+        key = (username.lower(), user["password_hash"], digest)
+        now = time.monotonic()
+        with self._verify_lock:
+            verified_at = self._verify_cache.get(key)
+            if verified_at is not None and now - verified_at < _VERIFY_CACHE_TTL_SECONDS:
+                return True
+
+        if not self._check_password(user["password_hash"], password):
+            return False
+
+        with self._verify_lock:
+            self._verify_cache[key] = now
+            self._verify_cache.move_to_end(key)
+            while len(self._verify_cache) > _VERIFY_CACHE_MAX_ENTRIES:
+                self._verify_cache.popitem(last=False)
+        return True
 
     def update_password(self, username: str, new_password: str) -> None:
         if not username or not new_password:
             raise ValueError("Username and new password are required.")
 
-        with self._lock:
-            payload = self._read_unsafe()
-            users = payload.get("users", [])
-            for user in users:
-                if user["username"].lower() == username.lower():
-                    user["password_hash"] = generate_password_hash(new_password)
-                    user["updated_at"] = datetime.now(timezone.utc).isoformat()
-                    self._write_unsafe(payload)
-                    return
+        password_hash = self._hash_password(new_password)
+
+        with self._lock.write_lock():
+            payload, users_by_name = self._load_unsafe()
+            user = users_by_name.get(username.lower())
+            if user is not None:
+                user["password_hash"] = password_hash
+                user["updated_at"] = datetime.now(timezone.utc).isoformat()
+                self._write_unsafe(payload)
+                return
 
         raise ValueError("User not found.")
 
+    def _hash_password(self, password: str) -> str:
+        if self.hash_method:
+            return self._kdf_executor.submit(generate_password_hash, password, self.hash_method).result()
+        return self._kdf_executor.submit(generate_password_hash, password).result()
+
+    def _check_password(self, password_hash: str, password: str) -> bool:
+        return self._kdf_executor.submit(check_password_hash, password_hash, password).result()
+
     def get_user(self, username: str) -> Optional[Dict]:
         if not username:
             return None
 
-        with self._lock:
-            payload = self._read_unsafe()
-            for user in payload.get("users", []):
-                if user["username"].lower() == username.lower():
-                    if "is_admin" not in user:
-                        user["is_admin"] = False
-                    return user
-        return None
+        with self._lock.read_lock():
+            _, users_by_name = self._load_unsafe()
+            user = users_by_name.get(username.lower())
+
+        if user is None:
+            return None
+        return {"is_admin": False, **user}
+
+    def _load_unsafe(self) -> Tuple[Dict, Dict[str, Dict]]:
+        # The parsed file and its lowercase-username index are reused until the file's
+        # mtime/size changes, so logins skip the JSON parse and the linear scan.
+        signature = self._file_signature()
+        cached = self._cache
+        if cached is not None and signature is not None and cached[0] == signature:
+            return cached[1], cached[2]
+
+        payload = self._read_unsafe()
+        users_by_name = self._index_users(payload)
+        if signature is not None:
+            self._cache = (signature, payload, users_by_name)
+        return payload, users_by_name
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.json_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _index_users(payload: Dict) -> Dict[str, Dict]:
+        return {str(user.get("username", "")).lower(): user for user in payload.get("users", [])}
 
     def _read_unsafe(self) -> Dict:
         try:
-            with open(self.json_path, "r", encoding="utf-8") as file:
-                payload = json.load(file)
+            with open(self.json_path, "rb") as file:
+                payload = orjson.loads(file.read())
                 if isinstance(payload, dict):
                     return payload
-        except (json.JSONDecodeError, FileNotFoundError):
+        except (orjson.JSONDecodeError, FileNotFoundError):
             pass
         return {"next_id": 1, "users": []}
 
     def _write_unsafe(self, payload: Dict) -> None:
-        with open(self.json_path, "w", encoding="utf-8") as file:
-            json.dump(payload, file, indent=2, ensure_ascii=False)
+        try:
+            atomic_write(self.json_path, orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        except Exception:
+            self._cache = None
+            raise
+
+        signature = self._file_signature()
+        self._cache = (signature, payload, self._index_users(payload)) if signature is not None else None
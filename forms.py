@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+MAX_USERNAME_LENGTH = 64
+MAX_PASSWORD_LENGTH = 256
+
+
+@dataclass(slots=True)
+class Credentials:
+    username: str
+    password: str
+    confirm_password: str = ""
+    reset_key: str = ""
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any], password_field: str = "password") -> "Credentials":
+        # Oversized values are rejected here, before they can reach the password hash,
+        # whose cost would otherwise scale with attacker-supplied input.
+        values = {}
+        for field, key, limit in (
+            ("username", "username", MAX_USERNAME_LENGTH),
+            ("password", password_field, MAX_PASSWORD_LENGTH),
+            ("confirm_password", "confirm_password", MAX_PASSWORD_LENGTH),
+            ("reset_key", "reset_key", MAX_PASSWORD_LENGTH),
+        ):
+            value = data.get(key)
+            value = "" if value is None else str(value).strip()
+            if len(value) > limit:
+                raise ValueError(f"{field.replace('_', ' ').capitalize()} is too long.")
+            values[field] = value
+        return cls(**values)
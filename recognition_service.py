@@ -1,6 +1,9 @@
 import io
 import logging
+import os
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 
 import cv2
@@ -9,8 +12,18 @@ import numpy as np
 from PIL import Image, ImageOps
 
 from config import AppConfig
+from face_index import ENCODING_DIMENSION, FaceIndex
 from student_db import StudentDB
 
+try:
+    from turbojpeg import TJPF_RGB, TurboJPEG
+
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):  # PyTurboJPEG or libturbojpeg is not installed.
+    _turbo_jpeg = None
+
+_EXIF_ORIENTATION_TAG = 0x0112
+
 
 class RecognitionService:
     def __init__(
@@ -21,6 +34,9 @@ class RecognitionService:
         encoding_model: str,
         resize_scale: float,
         use_grayscale: bool,
+        max_frame_edge: int = 0,
+        strong_match_distance: float = 0.0,
+        registration_upsample: int = 1,
     ) -> None:
         self.student_db = student_db
         self.tolerance = tolerance
@@ -28,80 +44,251 @@ class RecognitionService:
         self.encoding_model = encoding_model if encoding_model in {"small", "large"} else "small"
         self.resize_scale = max(0.1, min(float(resize_scale), 1.0))
         self.use_grayscale = bool(use_grayscale)
+        self.max_frame_edge = max(0, int(max_frame_edge))
+        self.strong_match_distance = max(0.0, min(float(strong_match_distance), float(tolerance)))
+        self.registration_upsample = max(0, int(registration_upsample))
         self._cache_lock = threading.Lock()
-        self._known_encodings: List[np.ndarray] = []
-        self._known_students: List[Dict] = []
+        self._reload_lock = threading.Lock()
+        self._index_signature: Optional[np.ndarray] = None
+        # PIL/OpenCV release the GIL while decoding, so frames of one batch decode in parallel.
+        self._decode_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="frame-decode")
+        self._face_index = FaceIndex.empty()
+        self._students_by_id: Dict[int, Dict] = {}
         self.reload_known_faces()
 
-    @staticmethod
-    def _is_valid_encoding(value) -> bool:
-        if not isinstance(value, list) or len(value) != 128:
-            return False
+    @property
+    def batches_detection(self) -> bool:
+        # Only dlib's CNN detector runs several same-sized images in one forward pass.
+        return self.detection_model == "cnn"
+
+    def reload_known_faces(self) -> int:
+        # Registration, deletion and the per-batch source check can all reload at once;
+        # serialising them keeps each index swap from one generation.
+        with self._reload_lock:
+            return self._reload_known_faces_unlocked()
+
+    def _reload_known_faces_unlocked(self) -> int:
+        signature = self._source_signature()
+        # StudentDB already keeps the float32 matrix in memory and on disk, so the index is
+        # built straight from it; no second copy is written on the registration path.
+        student_ids, matrix, students_by_id = self._build_encoding_matrix()
+        face_index = FaceIndex(matrix, student_ids, strong_match_distance=self.strong_match_distance)
 
+        with self._cache_lock:
+            self._face_index = face_index
+            self._students_by_id = students_by_id
+            self._index_signature = signature
+
+        logging.info("Loaded %d valid face encodings", len(face_index))
+        return len(face_index)
+
+    def warm_up(self) -> None:
+        # Pays first-call costs (decoder init, dlib buffer allocation, index search setup)
+        # at startup instead of on the first ESP32 frame.
+        started = time.perf_counter()
         try:
-            vector = np.array(value, dtype=np.float64)
-            return bool(np.isfinite(vector).all())
+            blank = np.zeros((160, 160, 3), dtype=np.uint8)
+            success, jpeg_buffer = cv2.imencode(".jpg", blank)
+            if success:
+                self.recognize_batch([jpeg_buffer.tobytes()])
+
+            probes = face_recognition.face_encodings(
+                blank,
+                known_face_locations=[(16, 144, 144, 16)],
+                model=self.encoding_model,
+            )
+            with self._cache_lock:
+                face_index = self._face_index
+            if probes and len(face_index):
+                face_index.search(probes)
         except Exception:
-            return False
+            logging.exception("Recognition warm-up failed")
+            return
 
-    def reload_known_faces(self) -> int:
-        students = self.student_db.get_students(include_encoding=True)
-        valid_encodings: List[np.ndarray] = []
-        valid_students: List[Dict] = []
+        logging.info("Recognition pipeline warmed up in %.0f ms", (time.perf_counter() - started) * 1000)
 
-        for student in students:
-            vector = student.get("encoding")
-            if not self._is_valid_encoding(vector):
-                logging.warning("Skipping invalid encoding for student id=%s", student.get("id"))
-                continue
+    def _build_encoding_matrix(self) -> Tuple[np.ndarray, np.ndarray, Dict[int, Dict]]:
+        students_by_id = {
+            int(student["id"]): student for student in self.student_db.get_students(include_encoding=False)
+        }
+        student_ids, matrix = self.student_db.get_encodings()
 
-            valid_encodings.append(np.array(vector, dtype=np.float64))
-            valid_students.append(student)
+        # Rows whose student was deleted, or that hold NaN/inf, never reach the index.
+        keep = np.isin(student_ids, np.fromiter(students_by_id, dtype=np.int64, count=len(students_by_id)))
+        keep &= np.isfinite(matrix).all(axis=1)
+        if not keep.all():
+            logging.warning("Skipping %d orphaned or invalid encodings", int((~keep).sum()))
 
-        with self._cache_lock:
-            self._known_encodings = valid_encodings
-            self._known_students = valid_students
+        return student_ids[keep], matrix[keep], students_by_id
 
-        logging.info("Loaded %d valid face encodings", len(valid_encodings))
-        return len(valid_encodings)
+    def _reload_if_source_changed(self) -> None:
+        # Student data can change outside registration (manual edits, restores); a stat per
+        # batch is enough to notice and rebuild the matrix only when it actually changed.
+        signature = self._source_signature()
+        if signature is None:
+            return
 
-    def _decode_and_prepare(self, image_bytes: bytes) -> np.ndarray:
-        image = Image.open(io.BytesIO(image_bytes))
-        image = ImageOps.exif_transpose(image)
-        image_array = np.array(image)
+        with self._cache_lock:
+            current = self._index_signature
+        if current is not None and np.array_equal(signature, current):
+            return
+
+        with self._reload_lock:
+            with self._cache_lock:
+                current = self._index_signature
+            if current is None or not np.array_equal(signature, current):
+                logging.info("Student data changed on disk; reloading face encodings")
+                self._reload_known_faces_unlocked()
 
-        if image_array.ndim == 2:
-            image_array = np.stack([image_array] * 3, axis=-1)
-        elif image_array.ndim == 3 and image_array.shape[2] == 4:
-            image_array = image_array[:, :, :3]
+    def _source_signature(self) -> Optional[np.ndarray]:
+        try:
+            stat = os.stat(self.student_db.json_path)
+        except OSError:
+            return None
+        encodings_signature = []
+        for path in (self.student_db.encodings_path, self.student_db.encodings_log_path):
+            try:
+                encodings_stat = os.stat(path)
+                encodings_signature += [encodings_stat.st_mtime_ns, encodings_stat.st_size]
+            except OSError:
+                encodings_signature += [0, 0]
+        return np.array([stat.st_mtime_ns, stat.st_size, *encodings_signature], dtype=np.int64)
 
-        if self.use_grayscale:
-            gray = cv2.cvtColor(image_array, cv2.COLOR_RGB2GRAY)
-            image_array = cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
+    def _decode_and_prepare(self, image_bytes: bytes) -> np.ndarray:
+        image_array, decoded_scale = self._decode_image(image_bytes)
+        image_array = self._apply_grayscale(image_array)
 
-        if self.resize_scale < 1.0:
+        source_edge = max(image_array.shape[:2]) / decoded_scale
+        remaining_scale = self._target_scale(source_edge) / decoded_scale
+        if remaining_scale < 0.999:
             image_array = cv2.resize(
                 image_array,
                 dsize=None,
-                fx=self.resize_scale,
-                fy=self.resize_scale,
+                fx=remaining_scale,
+                fy=remaining_scale,
                 interpolation=cv2.INTER_LINEAR,
             )
 
         return image_array
 
+    def _apply_grayscale(self, image_array: np.ndarray) -> np.ndarray:
+        if not self.use_grayscale:
+            return image_array
+        gray = cv2.cvtColor(image_array, cv2.COLOR_RGB2GRAY)
+        return cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
+
+    def _target_scale(self, source_edge: float) -> float:
+        # Detection cost grows with pixel count, so large uploads are capped at
+        # max_frame_edge on top of the configured resize_scale.
+        scale = self.resize_scale
+        if self.max_frame_edge and source_edge > self.max_frame_edge:
+            scale = min(scale, self.max_frame_edge / source_edge)
+        return scale
+
+    def decode_rgb(self, image_bytes: bytes) -> np.ndarray:
+        # Full-resolution decode for registration uploads, same decoders as the frame path.
+        return self._decode_image(image_bytes, downscale=False)[0]
+
+    def _decode_image(self, image_bytes: bytes, downscale: bool = True) -> Tuple[np.ndarray, float]:
+        # ESP32/browser JPEG frames carry no EXIF orientation, so libjpeg-turbo can decode
+        # straight to RGB and apply the configured downscale inside the IDCT.
+        if _turbo_jpeg is not None and image_bytes[:2] == b"\xff\xd8" and b"Exif" not in image_bytes[:64]:
+            scaling_factor = None
+            if downscale:
+                width, height, _, _ = _turbo_jpeg.decode_header(image_bytes)
+                scaling_factor = self._turbo_scaling_factor(self._target_scale(max(width, height)))
+            image_array = _turbo_jpeg.decode(image_bytes, pixel_format=TJPF_RGB, scaling_factor=scaling_factor)
+            return image_array, (scaling_factor[0] / scaling_factor[1]) if scaling_factor else 1.0
+
+        image = Image.open(io.BytesIO(image_bytes))
+        # exif_transpose copies the whole image; only pay for it when a rotation is tagged.
+        if image.getexif().get(_EXIF_ORIENTATION_TAG, 1) != 1:
+            image = ImageOps.exif_transpose(image)
+        # One conversion covers grayscale, palette and RGBA input and keeps the buffer contiguous.
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+
+        # np.asarray would hand dlib a read-only view of Pillow's buffer, so keep exactly one copy.
+        return np.array(image), 1.0
+
+    @staticmethod
+    def _turbo_scaling_factor(target_scale: float) -> Optional[Tuple[int, int]]:
+        if target_scale >= 1.0:
+            return None
+        candidates = [
+            factor for factor in _turbo_jpeg.scaling_factors
+            if target_scale <= factor[0] / factor[1] < 1.0
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda factor: factor[0] / factor[1])
+
     def extract_face_data(self, image_bytes: bytes) -> Tuple[Optional[np.ndarray], str]:
         image_array = self._decode_and_prepare(image_bytes)
-        face_locations = face_recognition.face_locations(image_array, model=self.detection_model)
+        return self._extract_face_data_from_arrays([image_array])[0]
+
+    def extract_face_data_from_images(self, rgb_images: List[np.ndarray]) -> List[Tuple[Optional[np.ndarray], str]]:
+        # Registration photos are often several megapixels: find the face on a downscaled
+        # copy, then encode the matching region of the full-resolution image.
+        image_arrays = [self._apply_grayscale(rgb_image) for rgb_image in rgb_images]
+        scales = [self._target_scale(max(image_array.shape[:2])) for image_array in image_arrays]
+        detection_images = [
+            image_array if scale >= 0.999
+            else cv2.resize(image_array, dsize=None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            for image_array, scale in zip(image_arrays, scales)
+        ]
+
+        # A registration photo is a single close-up face, so upsampling the detection image
+        # (4x the pixels per step) only adds cost.
+        detections = self._detect_faces(detection_images, upsample=self.registration_upsample)
+        results = []
+        for image_array, scale, face_locations in zip(image_arrays, scales, detections):
+            if scale < 0.999:
+                height, width = image_array.shape[:2]
+                face_locations = [
+                    (
+                        max(0, int(round(top / scale))),
+                        min(width, int(round(right / scale))),
+                        min(height, int(round(bottom / scale))),
+                        max(0, int(round(left / scale))),
+                    )
+                    for top, right, bottom, left in face_locations
+                ]
+            results.append(self._encode_single_face(image_array, face_locations))
+        return results
+
+    def _extract_face_data_from_arrays(self, image_arrays: List[np.ndarray]) -> List[Tuple[Optional[np.ndarray], str]]:
+        return [
+            self._encode_single_face(image_array, face_locations)
+            for image_array, face_locations in zip(image_arrays, self._detect_faces(image_arrays))
+        ]
 
+    def _detect_faces(self, image_arrays: List[np.ndarray], upsample: int = 1) -> List[List[Tuple[int, int, int, int]]]:
+        same_shape = len({image_array.shape for image_array in image_arrays}) == 1
+        if self.detection_model == "cnn" and len(image_arrays) > 1 and same_shape:
+            # The CNN detector runs one forward pass over the whole stack of frames.
+            return face_recognition.batch_face_locations(
+                image_arrays,
+                number_of_times_to_upsample=upsample,
+                batch_size=len(image_arrays),
+            )
+        return [
+            face_recognition.face_locations(image_array, number_of_times_to_upsample=upsample, model=self.detection_model)
+            for image_array in image_arrays
+        ]
+
+    def _encode_single_face(self, image_array: np.ndarray, face_locations: List) -> Tuple[Optional[np.ndarray], str]:
         if len(face_locations) == 0:
             return None, "no_face"
         if len(face_locations) > 1:
             return None, "multiple_faces"
 
+        # dlib only builds jittered crops for num_jitters > 1; pin it so a changed library
+        # default can never multiply the ResNet passes per registration or frame.
         encodings = face_recognition.face_encodings(
             image_array,
             known_face_locations=face_locations,
+            num_jitters=1,
             model=self.encoding_model,
         )
         if not encodings:
@@ -116,48 +303,84 @@ class RecognitionService:
         return encoding
 
     def recognize(self, image_bytes: bytes) -> Dict:
+        return self.recognize_batch([image_bytes])[0]
+
+    def recognize_batch(self, images: List[bytes]) -> List[Dict]:
+        results: List[Optional[Dict]] = [None] * len(images)
+        image_arrays: List[np.ndarray] = []
+        array_slots: List[int] = []
+
+        if len(images) > 1:
+            pending = [self._decode_executor.submit(self._decode_and_prepare, image_bytes) for image_bytes in images]
+        else:
+            pending = None
+
+        for slot, image_bytes in enumerate(images):
+            try:
+                image_array = pending[slot].result() if pending else self._decode_and_prepare(image_bytes)
+                image_arrays.append(image_array)
+                array_slots.append(slot)
+            except Exception as exc:
+                logging.exception("Recognition failure")
+                results[slot] = {"status": "error", "message": str(exc)}
+
         try:
-            probe_encoding, status = self.extract_face_data(image_bytes)
-            if status != "ok":
-                return {"status": status}
+            probe_slots: List[int] = []
+            probe_encodings: List[np.ndarray] = []
+            face_data = self._extract_face_data_from_arrays(image_arrays) if image_arrays else []
+            for slot, (encoding, status) in zip(array_slots, face_data):
+                if status != "ok":
+                    results[slot] = {"status": status}
+                    continue
+                probe_slots.append(slot)
+                probe_encodings.append(encoding)
 
-            with self._cache_lock:
-                known_encodings = list(self._known_encodings)
-                known_students = list(self._known_students)
+            if probe_slots:
+                self._reload_if_source_changed()
+                with self._cache_lock:
+                    face_index = self._face_index
+                    students_by_id = self._students_by_id
 
-            if not known_encodings:
-                return {"status": "unknown", "message": "No registered students."}
+                if not len(face_index):
+                    for slot in probe_slots:
+                        results[slot] = {"status": "unknown", "message": "No registered students."}
+                else:
+                    best_ids, best_distances = face_index.search(probe_encodings)
+                    for slot, best_id, best_distance in zip(probe_slots, best_ids, best_distances):
+                        results[slot] = self._match_result(int(best_id), float(best_distance), students_by_id)
 
-            distances = face_recognition.face_distance(known_encodings, probe_encoding)
-            best_index = int(np.argmin(distances))
-            best_distance = float(distances[best_index])
-            logging.info("Recognition best distance=%.5f threshold=%.3f", best_distance, self.tolerance)
+        except Exception as exc:
+            logging.exception("Recognition failure")
+            for slot in array_slots:
+                if results[slot] is None:
+                    results[slot] = {"status": "error", "message": str(exc)}
 
-            if best_distance > self.tolerance:
-                return {
-                    "status": "unknown",
-                    "distance": round(best_distance, 5),
-                    "threshold": self.tolerance,
-                }
+        return results
 
-            ratio = max(0.0, min(1.0, (self.tolerance - best_distance) / self.tolerance))
-            confidence = round(ratio * 100, 2)
-            student = known_students[best_index]
+    def _match_result(self, best_id: int, best_distance: float, students_by_id: Dict[int, Dict]) -> Dict:
+        logging.info("Recognition best distance=%.5f threshold=%.3f", best_distance, self.tolerance)
 
+        if best_distance > self.tolerance:
             return {
-                "status": "recognized",
-                "student_id": student["id"],
-                "name": student["name"],
-                "roll_number": student["roll_number"],
-                "department": student["department"],
-                "confidence": confidence,
+                "status": "unknown",
                 "distance": round(best_distance, 5),
                 "threshold": self.tolerance,
             }
 
-        except Exception as exc:
-            logging.exception("Recognition failure")
-            return {"status": "error", "message": str(exc)}
+        ratio = max(0.0, min(1.0, (self.tolerance - best_distance) / self.tolerance))
+        confidence = round(ratio * 100, 2)
+        student = students_by_id[best_id]
+
+        return {
+            "status": "recognized",
+            "student_id": student["id"],
+            "name": student["name"],
+            "roll_number": student["roll_number"],
+            "department": student["department"],
+            "confidence": confidence,
+            "distance": round(best_distance, 5),
+            "threshold": self.tolerance,
+        }
 
 
 def build_default_recognition_service(student_db: StudentDB) -> RecognitionService:
@@ -168,4 +391,7 @@ def build_default_recognition_service(student_db: StudentDB) -> RecognitionServi
         encoding_model=AppConfig.FACE_ENCODING_MODEL,
         resize_scale=AppConfig.FACE_FRAME_RESIZE_SCALE,
         use_grayscale=AppConfig.FACE_USE_GRAYSCALE,
+        max_frame_edge=AppConfig.FACE_FRAME_MAX_EDGE,
+        strong_match_distance=AppConfig.FACE_STRONG_MATCH_DISTANCE,
+        registration_upsample=AppConfig.REGISTRATION_DETECTION_UPSAMPLE,
     )
@@ -1,20 +1,24 @@
-import base64
 from functools import wraps
 from typing import Callable, Optional, Tuple
 
-import cv2
 import numpy as np
-from flask import Blueprint, jsonify, request, session
+import pybase64
+from flask import Blueprint, g, jsonify, request, session
 
+from batcher import DynamicBatcher
+from config import AppConfig
 from faculty_db import FacultyDB
+from forms import Credentials
 from student_db import StudentDB
 from recognition_service import RecognitionService
+from routes.auth import load_faculty_session
+from utils import strip_data_uri_prefix
 
 
 def _login_required(handler: Callable):
     @wraps(handler)
     def wrapper(*args, **kwargs):
-        if not session.get("faculty_logged_in"):
+        if not g.faculty.logged_in:
             return jsonify({"status": "error", "message": "Unauthorized"}), 401
         return handler(*args, **kwargs)
 
@@ -27,14 +31,31 @@ def create_registration_blueprint(
     faculty_db: FacultyDB,
 ) -> Blueprint:
     bp = Blueprint("registration", __name__)
+    bp.before_request(load_faculty_session)
+    if recognition_service.batches_detection:
+        # Concurrent registrations share one CNN detection pass; HOG gains nothing from
+        # batching, so there each request detects on its own thread without waiting.
+        registration_batcher = DynamicBatcher(
+            recognition_service.extract_face_data_from_images,
+            max_batch_size=AppConfig.REGISTRATION_BATCH_SIZE,
+            max_delay_seconds=AppConfig.REGISTRATION_BATCH_MAX_DELAY_MS / 1000.0,
+            name="registration-batcher",
+        )
+        extract_face_encoding = registration_batcher.process
+    else:
+        def extract_face_encoding(rgb_image: np.ndarray) -> Tuple[Optional[np.ndarray], str]:
+            return recognition_service.extract_face_data_from_images([rgb_image])[0]
 
     @bp.post("/api/faculty/login")
     def faculty_login():
-        payload = request.get_json(silent=True) or {}
-        username = str(payload.get("username", "")).strip()
-        password = str(payload.get("password", "")).strip()
+        payload = request.get_json(silent=True)
+        try:
+            creds = Credentials.from_mapping(payload if isinstance(payload, dict) else {})
+        except ValueError:
+            return jsonify({"status": "error", "message": "Invalid credentials."}), 401
+        username = creds.username
 
-        if not faculty_db.verify_user(username, password):
+        if not faculty_db.verify_user(username, creds.password):
             return jsonify({"status": "error", "message": "Invalid credentials."}), 401
 
         session["faculty_logged_in"] = True
@@ -50,8 +71,8 @@ def create_registration_blueprint(
 
     @bp.get("/api/faculty/session")
     def faculty_session():
-        if session.get("faculty_logged_in"):
-            return jsonify({"logged_in": True, "username": session.get("faculty_username")})
+        if g.faculty.logged_in:
+            return jsonify({"logged_in": True, "username": g.faculty.username})
         return jsonify({"logged_in": False})
 
     @bp.post("/api/register-student")
@@ -73,14 +94,14 @@ def create_registration_blueprint(
             return jsonify({"status": "error", "message": "image_base64 or image is required."}), 400
 
         if image_base64:
-            rgb_image = _decode_base64_image(image_base64)
+            rgb_image = _decode_base64_image(recognition_service, image_base64)
         else:
-            rgb_image = _decode_bytes_image(image_file.read())
+            rgb_image = _decode_bytes_image(recognition_service, image_file.read())
 
         if rgb_image is None:
             return jsonify({"status": "error", "message": "Invalid image data."}), 400
 
-        encoding, status = _extract_single_face_encoding(recognition_service, rgb_image)
+        encoding, status = extract_face_encoding(rgb_image)
         if status == "no_face":
             return jsonify({"status": "no_face", "message": "No face detected in registration image."}), 200
         if status == "multiple_faces":
@@ -91,7 +112,7 @@ def create_registration_blueprint(
                 name=name,
                 roll_number=roll_number,
                 department=department,
-                encoding=encoding.tolist(),
+                encoding=encoding,
             )
             recognition_service.reload_known_faces()
         except ValueError as exc:
@@ -134,31 +155,17 @@ def create_registration_blueprint(
     return bp
 
 
-def _decode_base64_image(image_base64: str) -> Optional[np.ndarray]:
+def _decode_base64_image(recognition_service: RecognitionService, image_base64: str) -> Optional[np.ndarray]:
     try:
-        encoded = image_base64
-        if "," in encoded:
-            encoded = encoded.split(",", 1)[1]
-        image_bytes = base64.b64decode(encoded)
-        return _decode_bytes_image(image_bytes)
+        image_bytes = pybase64.b64decode(strip_data_uri_prefix(image_base64))
+        return _decode_bytes_image(recognition_service, image_bytes)
     except Exception:
         return None
 
 
-def _decode_bytes_image(image_bytes: bytes) -> Optional[np.ndarray]:
+def _decode_bytes_image(recognition_service: RecognitionService, image_bytes: bytes) -> Optional[np.ndarray]:
+    # Decodes straight to RGB (libjpeg-turbo or Pillow) instead of BGR plus a cvtColor pass.
     try:
-        image_array = np.frombuffer(image_bytes, dtype=np.uint8)
-        bgr_image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
-        if bgr_image is None:
-            return None
-        return cv2.cvtColor(bgr_image, cv2.COLOR_BGR2RGB)
+        return recognition_service.decode_rgb(image_bytes)
     except Exception:
         return None
-
-
-def _extract_single_face_encoding(recognition_service: RecognitionService, rgb_image: np.ndarray) -> Tuple[Optional[np.ndarray], str]:
-    success, jpeg_buffer = cv2.imencode(".jpg", cv2.cvtColor(rgb_image, cv2.COLOR_RGB2BGR))
-    if not success:
-        return None, "no_face"
-
-    return recognition_service.extract_face_data(jpeg_buffer.tobytes())
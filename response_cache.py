@@ -0,0 +1,26 @@
+import threading
+from typing import Callable, Dict, Hashable, Tuple
+
+
+class VersionedResponseCache:
+    def __init__(self, max_entries: int = 64) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[int, bytes]] = {}
+        self._max_entries = max(1, int(max_entries))
+
+    def get_or_build(self, key: Hashable, version: int, build: Callable[[], bytes]) -> bytes:
+        # Callers must read `version` before building so a concurrent write can only
+        # leave a stale body under an outdated version, never under the current one.
+        with self._lock:
+            cached = self._entries.get(key)
+
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        body = build()
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self._max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (version, body)
+
+        return body
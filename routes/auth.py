@@ -1,14 +1,33 @@
+from dataclasses import dataclass
 from functools import wraps
 
-from flask import Blueprint, redirect, render_template, request, session, url_for
+from flask import Blueprint, g, redirect, render_template, request, session, url_for
 
 from faculty_db import FacultyDB
+from forms import Credentials
+from routes.rendering import render_page
+
+
+@dataclass(frozen=True, slots=True)
+class FacultySession:
+    logged_in: bool
+    username: str
+    is_admin: bool
+
+
+def load_faculty_session() -> None:
+    # Decoded once per request; handlers and decorators read g.faculty afterwards.
+    g.faculty = FacultySession(
+        logged_in=bool(session.get("faculty_logged_in")),
+        username=session.get("faculty_username", "Faculty"),
+        is_admin=bool(session.get("faculty_is_admin")),
+    )
 
 
 def faculty_login_required(handler):
     @wraps(handler)
     def wrapper(*args, **kwargs):
-        if not session.get("faculty_logged_in"):
+        if not g.faculty.logged_in:
             return redirect(url_for("auth.faculty_page"))
         return handler(*args, **kwargs)
 
@@ -17,22 +36,26 @@ def faculty_login_required(handler):
 
 def create_auth_blueprint(faculty_db: FacultyDB, reset_key: str) -> Blueprint:
     bp = Blueprint("auth", __name__)
+    bp.before_request(load_faculty_session)
 
     @bp.get("/faculty")
     def faculty_page():
-        if session.get("faculty_logged_in"):
+        if g.faculty.logged_in:
             return redirect(url_for("dashboard.dashboard_page"))
-        return render_template("faculty.html", error=request.args.get("error"))
+        return render_page("faculty.html", error=request.args.get("error"))
 
     @bp.route("/faculty/login", methods=["GET", "POST"])
     def faculty_login():
         if request.method == "GET":
             return redirect(url_for("auth.faculty_page"))
 
-        username = str(request.form.get("username", "")).strip()
-        password = str(request.form.get("password", "")).strip()
+        try:
+            creds = Credentials.from_mapping(request.form)
+        except ValueError:
+            return render_template("faculty.html", error="Invalid credentials."), 401
+        username = creds.username
 
-        if not faculty_db.verify_user(username, password):
+        if not faculty_db.verify_user(username, creds.password):
             return render_template("faculty.html", error="Invalid credentials."), 401
 
         user = faculty_db.get_user(username)
@@ -44,16 +67,18 @@ def create_auth_blueprint(faculty_db: FacultyDB, reset_key: str) -> Blueprint:
 
     @bp.route("/faculty/register", methods=["GET", "POST"])
     def faculty_register():
-        if not session.get("faculty_logged_in"):
+        if not g.faculty.logged_in:
             return redirect(url_for("auth.faculty_page", error="Admin login required."))
-        if not session.get("faculty_is_admin"):
+        if not g.faculty.is_admin:
             return redirect(url_for("auth.faculty_page", error="Admin access required."))
         if request.method == "GET":
-            return render_template("faculty_register.html", error=None, success=None)
+            return render_page("faculty_register.html", error=None, success=None)
 
-        username = str(request.form.get("username", "")).strip()
-        password = str(request.form.get("password", "")).strip()
-        confirm = str(request.form.get("confirm_password", "")).strip()
+        try:
+            creds = Credentials.from_mapping(request.form)
+        except ValueError as exc:
+            return render_template("faculty_register.html", error=str(exc), success=None), 400
+        username, password, confirm = creds.username, creds.password, creds.confirm_password
 
         if not username or not password:
             return render_template(
@@ -83,12 +108,14 @@ def create_auth_blueprint(faculty_db: FacultyDB, reset_key: str) -> Blueprint:
     @bp.route("/faculty/forgot", methods=["GET", "POST"])
     def faculty_forgot():
         if request.method == "GET":
-            return render_template("faculty_forgot.html", error=None, success=None)
+            return render_page("faculty_forgot.html", error=None, success=None)
 
-        username = str(request.form.get("username", "")).strip()
-        reset_code = str(request.form.get("reset_key", "")).strip()
-        new_password = str(request.form.get("new_password", "")).strip()
-        confirm = str(request.form.get("confirm_password", "")).strip()
+        try:
+            creds = Credentials.from_mapping(request.form, password_field="new_password")
+        except ValueError as exc:
+            return render_template("faculty_forgot.html", error=str(exc), success=None), 400
+        username, reset_code = creds.username, creds.reset_key
+        new_password, confirm = creds.password, creds.confirm_password
 
         if reset_code != reset_key:
             return render_template("faculty_forgot.html", error="Invalid reset key.", success=None), 401
@@ -1,27 +1,21 @@
-from flask import Blueprint, render_template, session
+from flask import Blueprint, g
 
-from routes.auth import faculty_login_required
+from routes.auth import faculty_login_required, load_faculty_session
+from routes.rendering import render_page
 
 
 def create_dashboard_blueprint() -> Blueprint:
     bp = Blueprint("dashboard", __name__)
+    bp.before_request(load_faculty_session)
 
     @bp.get("/dashboard")
     @faculty_login_required
     def dashboard_page():
-        return render_template(
-            "dashboard.html",
-            username=session.get("faculty_username", "Faculty"),
-            is_admin=bool(session.get("faculty_is_admin")),
-        )
+        return render_page("dashboard.html", username=g.faculty.username, is_admin=g.faculty.is_admin)
 
     @bp.get("/attendance")
     @faculty_login_required
     def attendance_page():
-        return render_template(
-            "index.html",
-            username=session.get("faculty_username", "Faculty"),
-            is_admin=bool(session.get("faculty_is_admin")),
-        )
+        return render_page("index.html", username=g.faculty.username, is_admin=g.faculty.is_admin)
 
     return bp
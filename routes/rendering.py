@@ -0,0 +1,19 @@
+from flask import current_app, render_template, request
+
+from response_cache import VersionedResponseCache
+
+_RENDER_CACHE_KEY = "rendered_pages"
+_RENDER_CACHE_ENTRIES = 256
+
+
+def render_page(template_name: str, **context) -> str:
+    # The GET pages only vary by a few short strings, so their HTML is rendered once per
+    # distinct context. url_for output depends on the mount point, hence script_root.
+    # The cache lives on the app, so apps with other templates or config never share pages.
+    app = current_app._get_current_object()
+    if app.debug or app.config.get("TEMPLATES_AUTO_RELOAD"):
+        return render_template(template_name, **context)
+
+    cache = app.extensions.setdefault(_RENDER_CACHE_KEY, VersionedResponseCache(max_entries=_RENDER_CACHE_ENTRIES))
+    key = (request.script_root, template_name, tuple(sorted(context.items())))
+    return cache.get_or_build(key, 0, lambda: render_template(template_name, **context))
@@ -6,4 +6,4 @@ if (-not (Test-Path ".venv")) {
 }
 
 . ".\.venv\Scripts\Activate.ps1"
-python backend\app.py
+python app.py
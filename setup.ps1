@@ -55,4 +55,4 @@ Write-Host ""
 Write-Host "Setup complete." -ForegroundColor Green
 Write-Host "Next commands:" -ForegroundColor Cyan
 Write-Host "1) .\.venv\Scripts\Activate.ps1"
-Write-Host "2) python backend\app.py"
+Write-Host "2) python app.py"
@@ -34,4 +34,4 @@ echo ""
 echo "Setup complete."
 echo "Next commands:"
 echo "1) source .venv/bin/activate"
-echo "2) python backend/app.py"
+echo "2) python app.py"
@@ -1,37 +1,80 @@
-import json
+import io
+import logging
 import os
-import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import orjson
+
+from face_index import ENCODING_DIMENSION
+from utils import ReadWriteLock, atomic_write
+
+_PUBLIC_FIELDS = ("id", "name", "roll_number", "department", "created_at", "updated_at")
+_public_values = itemgetter(*_PUBLIC_FIELDS)
+# One appended encoding: little-endian int64 student id followed by 128 float32 values.
+_ENCODING_ROW = np.dtype([("id", "<i8"), ("encoding", "<f4", (ENCODING_DIMENSION,))])
+_COMPACTION_RATIO = 0.3
+_MIN_ENCODING_LOG_ROWS = 64
 
 
 class StudentDB:
-    def __init__(self, json_path: str) -> None:
+    def __init__(self, json_path: str, legacy_json_path: Optional[str] = None) -> None:
+        # json_path is a JSON Lines log: a {"next_id": n} header, one line per registered
+        # student and a {"delete": id} tombstone per removal, so writes append one line.
         self.json_path = json_path
-        self._lock = threading.Lock()
+        self.legacy_json_path = legacy_json_path
+        # Encodings live next to the metadata as one (N, 128) float32 matrix with a parallel
+        # id array, so the student log stays small and matching never rebuilds it from lists.
+        # New rows are appended to encodings_log_path and folded into the npz on compaction.
+        self.encodings_path = f"{os.path.splitext(json_path)[0]}_encodings.npz"
+        self.encodings_log_path = f"{os.path.splitext(json_path)[0]}_encodings.rows"
+        # Dashboard and recognition reads share the lock; two readers missing the cache at
+        # once just parse the same file twice and store equal payloads.
+        self._lock = ReadWriteLock()
+        self._cache: Optional[Tuple[Tuple[int, int], Dict]] = None
+        self._dead_lines = 0
+        self._needs_newline = False
+        self._compaction_pending = False
+        self._compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="student-compactor")
+        self._encodings_cache: Optional[Tuple[Tuple, np.ndarray, np.ndarray]] = None
+        # Rows live in over-allocated buffers so an append is amortised O(1); callers get
+        # read-only views of the filled prefix, which later appends never touch.
+        self._encoding_ids = np.empty(0, dtype=np.int64)
+        self._encoding_matrix = np.empty((0, ENCODING_DIMENSION), dtype=np.float32)
+        self._encoding_count = 0
+        self._encoding_log_rows = 0
+        self._encoding_log_size = 0
         self._ensure_file()
+        self._migrate_inline_encodings()
 
     def _ensure_file(self) -> None:
         os.makedirs(os.path.dirname(self.json_path), exist_ok=True)
         if not os.path.exists(self.json_path):
-            with self._lock:
-                with open(self.json_path, "w", encoding="utf-8") as file:
-                    json.dump({"next_id": 1, "students": []}, file, indent=2)
+            payload = {"next_id": 1, "students": []}
+            if self.legacy_json_path and os.path.exists(self.legacy_json_path):
+                payload = self._parse_legacy_json(self.legacy_json_path)
+                logging.info("Imported %d students from %s", len(payload["students"]), self.legacy_json_path)
+            with self._lock.write_lock():
+                self._write_unsafe(payload)
 
     def register_student(
         self,
         name: str,
         roll_number: str,
         department: str,
-        encoding: List[float],
+        encoding: np.ndarray,
     ) -> Dict:
-        with self._lock:
-            payload = self._read_unsafe()
-            students = payload.get("students", [])
+        # dlib hands back a float64 ndarray; one cast to float32, no per-value Python floats.
+        vector = np.asarray(encoding, dtype=np.float32).reshape(ENCODING_DIMENSION)
 
-            for student in students:
-                if student["roll_number"].lower() == roll_number.lower():
-                    raise ValueError("Student with this roll number already exists.")
+        with self._lock.write_lock():
+            payload = self._read_unsafe()
+            roll_key = roll_number.strip().casefold()
+            if roll_key in payload["roll_index"]:
+                raise ValueError("Student with this roll number already exists.")
 
             student_id = int(payload.get("next_id", 1))
             now_iso = datetime.now(timezone.utc).isoformat()
@@ -41,70 +84,343 @@ class StudentDB:
                 "name": name.strip(),
                 "roll_number": roll_number.strip(),
                 "department": department.strip(),
-                "encoding": [float(value) for value in encoding],
                 "created_at": now_iso,
                 "updated_at": now_iso,
             }
 
-            students.append(student)
-            payload["students"] = students
+            # Encodings first: a crash before the metadata write only leaves an orphan row,
+            # which lookups ignore, never a student without an encoding.
+            self._append_encoding_unsafe(student_id, vector)
+            self._append_unsafe(student, payload)
+            payload["by_id"][student_id] = student
+            payload["roll_index"][roll_key] = student_id
             payload["next_id"] = student_id + 1
-            self._write_unsafe(payload)
+            self._schedule_compaction_unsafe(payload)
             return student
 
     def get_students(self, include_encoding: bool = False) -> List[Dict]:
-        with self._lock:
-            payload = self._read_unsafe()
+        # Writers update the cached payload in place, so it is only walked under the read lock.
+        with self._lock.read_lock():
+            students = self._read_unsafe()["by_id"].values()
+            if include_encoding:
+                ids, matrix = self._read_encodings_unsafe()
+                rows = dict(zip(ids.tolist(), matrix))
+                return [
+                    {**student, "encoding": rows[student["id"]].tolist()} if student["id"] in rows else dict(student)
+                    for student in students
+                ]
 
-        students = payload.get("students", [])
-        if include_encoding:
-            return students
-
-        sanitized: List[Dict] = []
-        for student in students:
-            sanitized.append(
-                {
-                    "id": student["id"],
-                    "name": student["name"],
-                    "roll_number": student["roll_number"],
-                    "department": student["department"],
-                    "created_at": student.get("created_at", ""),
-                    "updated_at": student.get("updated_at", ""),
-                }
-            )
-        return sanitized
+            return [dict(zip(_PUBLIC_FIELDS, _public_values(student))) for student in students]
 
     def delete_student(self, student_id: int) -> bool:
-        with self._lock:
+        with self._lock.write_lock():
             payload = self._read_unsafe()
-            students = payload.get("students", [])
-            remaining = [student for student in students if int(student["id"]) != int(student_id)]
-
-            if len(remaining) == len(students):
+            student_id = int(student_id)
+            student = payload["by_id"].get(student_id)
+            if student is None:
                 return False
 
-            payload["students"] = remaining
-            self._write_unsafe(payload)
+            self._append_unsafe({"delete": student_id}, payload)
+            del payload["by_id"][student_id]
+            payload["roll_index"].pop(student["roll_number"].casefold(), None)
+            # The tombstone and the record it cancels are both dead weight in the log; the
+            # student's encoding row stays as an orphan until compaction drops it.
+            self._dead_lines += 2
+            self._schedule_compaction_unsafe(payload)
             return True
 
+    def _schedule_compaction_unsafe(self, payload: Dict) -> None:
+        # Rewrites are O(N), so they run on the compactor thread, never on a request.
+        if not self._compaction_pending and self._needs_compaction_unsafe(payload):
+            self._compaction_pending = True
+            self._compactor.submit(self._compact)
+
+    def _compact(self) -> None:
+        try:
+            with self._lock.write_lock():
+                self._compaction_pending = False
+                payload = self._read_unsafe()
+                if not self._needs_compaction_unsafe(payload):
+                    return
+                if self._dead_lines:
+                    self._write_unsafe(payload)
+                ids, matrix = self._read_encodings_unsafe()
+                keep = np.isin(ids, np.fromiter(payload["by_id"], dtype=np.int64, count=len(payload["by_id"])))
+                self._write_encodings_unsafe(ids[keep], matrix[keep])
+        except Exception:
+            logging.exception("Compacting %s failed", self.json_path)
+
+    def _needs_compaction_unsafe(self, payload: Dict) -> bool:
+        live = len(payload["by_id"])
+        return (
+            self._dead_lines > _COMPACTION_RATIO * max(1, live)
+            or self._encoding_log_rows > max(_MIN_ENCODING_LOG_ROWS, _COMPACTION_RATIO * live)
+        )
+
+    def get_encodings(self) -> Tuple[np.ndarray, np.ndarray]:
+        with self._lock.read_lock():
+            return self._read_encodings_unsafe()
+
     def get_student_by_id(self, student_id: int) -> Optional[Dict]:
-        with self._lock:
+        # A copy, so callers cannot mutate the live record outside the write lock.
+        with self._lock.read_lock():
+            student = self._read_unsafe()["by_id"].get(int(student_id))
+            return dict(student) if student is not None else None
+
+    def _migrate_inline_encodings(self) -> None:
+        # Older student files carry each encoding as a 128-float list per student.
+        with self._lock.write_lock():
             payload = self._read_unsafe()
-            for student in payload.get("students", []):
-                if int(student["id"]) == int(student_id):
-                    return student
-        return None
+            students = list(payload["by_id"].values())
+            if not any("encoding" in student for student in students):
+                return
+
+            ids, matrix = self._read_encodings_unsafe()
+            rows = dict(zip(ids.tolist(), matrix))
+            for student in students:
+                if "encoding" not in student:
+                    continue
+                try:
+                    rows[student["id"]] = np.asarray(student["encoding"], dtype=np.float32).reshape(ENCODING_DIMENSION)
+                except (TypeError, ValueError):
+                    logging.warning("Dropping invalid encoding for student id=%s", student["id"])
+
+            ordered_ids = [student["id"] for student in students if student["id"] in rows]
+            self._write_encodings_unsafe(
+                np.array(ordered_ids, dtype=np.int64),
+                np.array([rows[student_id] for student_id in ordered_ids], dtype=np.float32).reshape(-1, ENCODING_DIMENSION),
+            )
+            stripped = [{key: value for key, value in student.items() if key != "encoding"} for student in students]
+            self._write_unsafe({"next_id": payload["next_id"], "students": stripped})
+            logging.info("Moved %d student encodings to %s", len(ordered_ids), self.encodings_path)
 
     def _read_unsafe(self) -> Dict:
+        # The parsed payload is reused until the student log changes on disk.
+        signature = self._file_signature(self.json_path)
+        cached = self._cache
+        if cached is not None and signature is not None and cached[0] == signature:
+            return cached[1]
+
+        payload = self._parse_file_unsafe()
+        self._cache = (signature, payload) if signature is not None else None
+        return payload
+
+    @staticmethod
+    def _file_signature(path: str) -> Optional[Tuple[int, int]]:
         try:
-            with open(self.json_path, "r", encoding="utf-8") as file:
-                payload = json.load(file)
-                if isinstance(payload, dict):
-                    return payload
-        except (json.JSONDecodeError, FileNotFoundError):
-            pass
-        return {"next_id": 1, "students": []}
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _parse_file_unsafe(self) -> Dict:
+        students: Dict[int, Dict] = {}
+        next_id = 1
+        dead_lines = 0
+        try:
+            with open(self.json_path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return self._indexed_payload(1, {})
+
+        for line_number, line in enumerate(data.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # A crash mid-append can only tear the last line; skip it rather than the file.
+                logging.warning("Skipping unreadable line %d in %s", line_number, self.json_path)
+                continue
+            if not isinstance(record, dict):
+                continue
+
+            if "delete" in record:
+                dead_lines += 2 if students.pop(int(record["delete"]), None) is not None else 1
+            elif "id" in record:
+                # Ids are normalised once per read so lookups compare ints directly, and
+                # timestamps are defaulted so get_students can fetch fields with itemgetter.
+                record["id"] = int(record["id"])
+                record.setdefault("created_at", "")
+                record.setdefault("updated_at", "")
+                if record["id"] in students:
+                    dead_lines += 1
+                students[record["id"]] = record
+                next_id = max(next_id, record["id"] + 1)
+            elif "next_id" in record:
+                next_id = max(next_id, int(record["next_id"]))
+
+        self._dead_lines = dead_lines
+        self._needs_newline = bool(data) and not data.endswith(b"\n")
+        return self._indexed_payload(next_id, students)
+
+    @staticmethod
+    def _indexed_payload(next_id: int, by_id: Dict[int, Dict]) -> Dict:
+        # by_id (in registration order) and the case-folded roll_number index make lookups
+        # and the duplicate check O(1); writers keep both up to date in place.
+        roll_index = {student["roll_number"].casefold(): student_id for student_id, student in by_id.items()}
+        return {"next_id": next_id, "by_id": by_id, "roll_index": roll_index}
 
     def _write_unsafe(self, payload: Dict) -> None:
-        with open(self.json_path, "w", encoding="utf-8") as file:
-            json.dump(payload, file, indent=2, ensure_ascii=False)
+        # Full rewrite, used to create, migrate and compact the log.
+        if "by_id" not in payload:
+            students = payload.get("students", [])
+            payload = self._indexed_payload(int(payload.get("next_id", 1)), {student["id"]: student for student in students})
+        lines = [orjson.dumps({"next_id": int(payload.get("next_id", 1))})]
+        lines.extend(orjson.dumps(student) for student in payload["by_id"].values())
+        try:
+            atomic_write(self.json_path, b"\n".join(lines) + b"\n")
+        except Exception:
+            self._cache = None
+            raise
+
+        self._dead_lines = 0
+        self._needs_newline = False
+        signature = self._file_signature(self.json_path)
+        self._cache = (signature, payload) if signature is not None else None
+
+    def _append_unsafe(self, record: Dict, payload: Dict) -> None:
+        line = orjson.dumps(record) + b"\n"
+        if self._needs_newline:
+            line = b"\n" + line
+        try:
+            fd = os.open(self.json_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_DSYNC", 0), 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        except Exception:
+            self._cache = None
+            raise
+
+        self._needs_newline = False
+        signature = self._file_signature(self.json_path)
+        self._cache = (signature, payload) if signature is not None else None
+
+    @staticmethod
+    def _parse_legacy_json(path: str) -> Dict:
+        try:
+            with open(path, "rb") as file:
+                payload = orjson.loads(file.read())
+        except (orjson.JSONDecodeError, OSError) as exc:
+            logging.warning("Skipping legacy student import from %s: %s", path, exc)
+            return {"next_id": 1, "students": []}
+
+        if not isinstance(payload, dict):
+            return {"next_id": 1, "students": []}
+        students = payload.get("students", [])
+        for student in students:
+            student["id"] = int(student["id"])
+            student.setdefault("created_at", "")
+            student.setdefault("updated_at", "")
+        return {"next_id": int(payload.get("next_id", 1)), "students": students}
+
+    def _encodings_signature(self) -> Tuple:
+        return self._file_signature(self.encodings_path), self._file_signature(self.encodings_log_path)
+
+    def _read_encodings_unsafe(self) -> Tuple[np.ndarray, np.ndarray]:
+        signature = self._encodings_signature()
+        cached = self._encodings_cache
+        if cached is not None and cached[0] == signature:
+            return cached[1], cached[2]
+
+        ids, matrix = self._parse_encodings_unsafe()
+        self._encoding_ids, self._encoding_matrix, self._encoding_count = ids, matrix, len(ids)
+        return self._publish_encodings_unsafe()
+
+    def _publish_encodings_unsafe(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Shared with callers through the cache, so freeze them against accidental writes.
+        ids = self._encoding_ids[:self._encoding_count]
+        matrix = self._encoding_matrix[:self._encoding_count]
+        ids.setflags(write=False)
+        matrix.setflags(write=False)
+        self._encodings_cache = (self._encodings_signature(), ids, matrix)
+        return ids, matrix
+
+    def _parse_encodings_unsafe(self) -> Tuple[np.ndarray, np.ndarray]:
+        ids = np.empty(0, dtype=np.int64)
+        matrix = np.empty((0, ENCODING_DIMENSION), dtype=np.float32)
+        try:
+            with np.load(self.encodings_path) as archive:
+                loaded_ids = archive["ids"].astype(np.int64)
+                loaded_matrix = archive["encodings"].astype(np.float32)
+            if loaded_matrix.shape == (len(loaded_ids), ENCODING_DIMENSION):
+                ids, matrix = loaded_ids, loaded_matrix
+            else:
+                logging.warning("Ignoring malformed student encodings in %s", self.encodings_path)
+        except FileNotFoundError:
+            pass
+        except Exception as exc:
+            logging.warning("Ignoring unreadable student encodings in %s: %s", self.encodings_path, exc)
+
+        try:
+            with open(self.encodings_log_path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            data = b""
+        # A crash mid-append can only tear the last row; it is dropped and overwritten.
+        rows = np.frombuffer(data, dtype=_ENCODING_ROW, count=len(data) // _ENCODING_ROW.itemsize)
+        self._encoding_log_rows = len(rows)
+        self._encoding_log_size = len(rows) * _ENCODING_ROW.itemsize
+        if len(rows):
+            ids = np.concatenate([ids, rows["id"].astype(np.int64)])
+            matrix = np.concatenate([matrix, rows["encoding"].astype(np.float32)])
+
+        # A crash between folding the log into the npz and truncating it repeats rows;
+        # the last copy of each id wins.
+        _, last_from_end = np.unique(ids[::-1], return_index=True)
+        if len(last_from_end) != len(ids):
+            keep = np.sort(len(ids) - 1 - last_from_end)
+            ids, matrix = ids[keep], matrix[keep]
+        return np.ascontiguousarray(ids), np.ascontiguousarray(matrix)
+
+    def _append_encoding_unsafe(self, student_id: int, vector: np.ndarray) -> None:
+        self._read_encodings_unsafe()
+        row = np.zeros(1, dtype=_ENCODING_ROW)
+        row["id"] = student_id
+        row["encoding"] = vector
+        try:
+            fd = os.open(self.encodings_log_path, os.O_WRONLY | os.O_CREAT | getattr(os, "O_DSYNC", 0), 0o644)
+            try:
+                os.ftruncate(fd, self._encoding_log_size)
+                os.lseek(fd, self._encoding_log_size, os.SEEK_SET)
+                os.write(fd, row.tobytes())
+            finally:
+                os.close(fd)
+        except Exception:
+            self._encodings_cache = None
+            raise
+
+        self._encoding_log_rows += 1
+        self._encoding_log_size += _ENCODING_ROW.itemsize
+        if self._encoding_count == len(self._encoding_ids):
+            capacity = max(_MIN_ENCODING_LOG_ROWS, 2 * self._encoding_count)
+            ids = np.empty(capacity, dtype=np.int64)
+            matrix = np.empty((capacity, ENCODING_DIMENSION), dtype=np.float32)
+            ids[:self._encoding_count] = self._encoding_ids[:self._encoding_count]
+            matrix[:self._encoding_count] = self._encoding_matrix[:self._encoding_count]
+            self._encoding_ids, self._encoding_matrix = ids, matrix
+        self._encoding_ids[self._encoding_count] = student_id
+        self._encoding_matrix[self._encoding_count] = vector
+        self._encoding_count += 1
+        self._publish_encodings_unsafe()
+
+    def _write_encodings_unsafe(self, ids: np.ndarray, matrix: np.ndarray) -> None:
+        # Full rewrite, used by migration and compaction: the npz takes every row, then the
+        # append log is emptied.
+        ids = np.array(ids, dtype=np.int64)
+        matrix = np.array(matrix, dtype=np.float32).reshape(-1, ENCODING_DIMENSION)
+        buffer = io.BytesIO()
+        np.savez(buffer, ids=ids, encodings=matrix)
+        try:
+            atomic_write(self.encodings_path, buffer.getvalue())
+            if os.path.exists(self.encodings_log_path):
+                os.truncate(self.encodings_log_path, 0)
+        except Exception:
+            self._encodings_cache = None
+            raise
+
+        self._encoding_log_rows = 0
+        self._encoding_log_size = 0
+        self._encoding_ids, self._encoding_matrix, self._encoding_count = ids, matrix, len(ids)
+        self._publish_encodings_unsafe()
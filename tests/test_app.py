@@ -0,0 +1,132 @@
+import base64
+import threading
+import time
+
+import numpy as np
+import pytest
+from jinja2 import DictLoader
+
+pytest.importorskip("face_recognition")
+
+import app as app_module
+from config import AppConfig
+
+
+class _BlockingRecognition:
+    batches_detection = False
+
+    def __init__(self, release: threading.Event) -> None:
+        self._release = release
+        self.frames = 0
+        self.extract_threads = []
+
+    def recognize_batch(self, images):
+        self.frames += len(images)
+        self._release.wait(timeout=10)
+        return [{"status": "no_face"} for _ in images]
+
+    def extract_face_data_from_images(self, images):
+        self.extract_threads.append(threading.current_thread())
+        return [(None, "no_face") for _ in images]
+
+    def decode_rgb(self, image_bytes):
+        return np.zeros((8, 8, 3), dtype=np.uint8)
+
+
+@pytest.fixture
+def release():
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def recognition(release):
+    return _BlockingRecognition(release)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch, recognition):
+    monkeypatch.setattr(AppConfig, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(AppConfig, "LEGACY_DATA_DIR", str(tmp_path / "backend" / "data"))
+    monkeypatch.setattr(AppConfig, "STUDENTS_DB_PATH", str(tmp_path / "students.jsonl"))
+    monkeypatch.setattr(AppConfig, "STUDENTS_LEGACY_JSON", str(tmp_path / "students.json"))
+    monkeypatch.setattr(AppConfig, "FACULTY_DB_PATH", str(tmp_path / "faculty_users.json"))
+    monkeypatch.setattr(AppConfig, "ATTENDANCE_DB_PATH", str(tmp_path / "attendance.db"))
+    monkeypatch.setattr(AppConfig, "ATTENDANCE_JSON", str(tmp_path / "attendance.json"))
+    monkeypatch.setattr(AppConfig, "RECOGNITION_WARMUP", False)
+    monkeypatch.setattr(AppConfig, "RECOGNITION_BATCH_MAX_DELAY_MS", 0)
+    monkeypatch.setattr(AppConfig, "RECOGNITION_QUEUE_CAPACITY", 1)
+    monkeypatch.setattr(app_module, "build_default_recognition_service", lambda student_db: recognition)
+    monkeypatch.setattr(app_module, "current_mode_ref", ["attendance"])
+    return app_module.create_app().test_client()
+
+
+def _frame():
+    return {"image_base64": base64.b64encode(b"frame").decode("ascii")}
+
+
+def test_idle_mode_drops_frames_before_recognition(client, recognition):
+    app_module.current_mode_ref[0] = "idle"
+    payload = client.post("/api/recognize", json=_frame()).get_json()
+    assert payload == {"status": "idle", "recognized": False, "mode": "idle"}
+    assert recognition.frames == 0
+
+
+def test_register_mode_still_runs_recognition(client, recognition, release):
+    release.set()
+    app_module.current_mode_ref[0] = "register"
+    assert client.post("/api/recognize", json=_frame()).get_json()["status"] == "no_face"
+    assert recognition.frames == 1
+    assert client.get("/api/latest-frame").status_code == 200
+
+
+def test_recognize_returns_503_when_recognition_is_saturated(client, release):
+    frame = _frame()
+    first = threading.Thread(target=client.post, args=("/api/recognize",), kwargs={"json": frame})
+    first.start()
+
+    deadline = time.monotonic() + 5
+    while client.get("/health").get_json()["recognition"]["pending"] < 1:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    response = client.post("/api/recognize", json=frame)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.get_json()["error"]["code"] == "overloaded"
+
+    release.set()
+    first.join(timeout=5)
+    assert client.post("/api/recognize", json=frame).get_json()["status"] == "no_face"
+
+
+def test_registration_with_hog_detects_on_the_request_thread(client, recognition):
+    login = {"username": AppConfig.FACULTY_USERNAME, "password": AppConfig.FACULTY_PASSWORD}
+    assert client.post("/api/faculty/login", json=login).status_code == 200
+
+    student = {"name": "Asha", "roll_number": "R1", "department": "CS", **_frame()}
+    assert client.post("/api/register-student", json=student).get_json()["status"] == "no_face"
+    assert recognition.extract_threads == [threading.current_thread()]
+
+
+def test_faculty_session_reflects_login_and_logout(client):
+    assert client.get("/api/faculty/session").get_json() == {"logged_in": False}
+    login = {"username": AppConfig.FACULTY_USERNAME, "password": AppConfig.FACULTY_PASSWORD}
+    client.post("/api/faculty/login", json=login)
+    assert client.get("/api/faculty/session").get_json() == {"logged_in": True, "username": AppConfig.FACULTY_USERNAME}
+    assert client.get("/dashboard").status_code == 200
+
+    client.post("/api/faculty/logout")
+    assert client.get("/api/faculty/session").get_json() == {"logged_in": False}
+    assert client.get("/dashboard").status_code == 302
+
+
+
+def test_rendered_pages_are_cached_per_app(client):
+    other = app_module.create_app()
+    other.jinja_env.loader = DictLoader({"faculty.html": "other app"})
+
+    assert b"other app" not in client.get("/faculty").data
+    assert other.test_client().get("/faculty").data == b"other app"
+    assert b"other app" not in client.get("/faculty").data
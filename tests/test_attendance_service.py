@@ -0,0 +1,41 @@
+from attendance_service import AttendanceService
+from response_cache import VersionedResponseCache
+
+
+class _CommitHookConnection:
+    # Delegates to the real connection but runs a hook just before the transaction commits.
+    def __init__(self, conn, before_commit):
+        self._conn = conn
+        self._before_commit = before_commit
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, *exc_info):
+        if exc_info[0] is None:
+            self._before_commit()
+        return self._conn.__exit__(*exc_info)
+
+
+def test_cached_read_during_write_is_not_kept_under_new_version(tmp_path):
+    service = AttendanceService(str(tmp_path / "attendance.db"), cooldown_seconds=0)
+    service._notify_buzzer = lambda pattern: None
+    cache = VersionedResponseCache()
+    day = "2024-01-02"
+
+    def cached_records():
+        version = service.data_version
+        return cache.get_or_build(("records", day), version, lambda: service.get_records(day))
+
+    assert cached_records() == []
+    service._conn = _CommitHookConnection(service._conn, cached_records)
+
+    student = {"id": 1, "name": "Asha", "roll_number": "R1", "department": "CS"}
+    service.mark_attendance(student, confidence=0.9, target_date=day)
+
+    records = cached_records()
+    assert [record["student_id"] for record in records] == [1]
+    service.close()
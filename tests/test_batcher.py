@@ -0,0 +1,61 @@
+import threading
+import time
+from queue import Full
+
+import pytest
+
+from batcher import DynamicBatcher
+
+
+def test_lone_item_is_dispatched_without_waiting_for_a_batch():
+    batcher = DynamicBatcher(lambda items: [item * 2 for item in items], max_batch_size=8, max_delay_seconds=0.0)
+
+    started = time.perf_counter()
+    assert batcher.process(21, timeout=1) == 42
+    assert time.perf_counter() - started < 0.05
+
+
+def test_items_queued_behind_a_running_batch_are_drained_together():
+    release = threading.Event()
+    batches = []
+
+    def handler(items):
+        batches.append(list(items))
+        release.wait(timeout=5)
+        return items
+
+    batcher = DynamicBatcher(handler, max_batch_size=8, max_delay_seconds=0.0)
+    first = batcher.submit(0)
+    deadline = time.monotonic() + 5
+    while batcher.stats()["inflight"] < 1:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+    queued = [batcher.submit(value) for value in (1, 2, 3)]
+    release.set()
+    assert [future.result(timeout=1) for future in [first, *queued]] == [0, 1, 2, 3]
+    assert batches == [[0], [1, 2, 3]]
+
+
+def test_workers_run_single_items_side_by_side():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def handler(items):
+        barrier.wait()
+        return items
+
+    batcher = DynamicBatcher(handler, max_batch_size=1, max_delay_seconds=0.0, workers=2)
+    futures = [batcher.submit(value) for value in (1, 2)]
+    assert [future.result(timeout=5) for future in futures] == [1, 2]
+
+
+def test_submit_raises_full_when_pending_limit_is_reached():
+    release = threading.Event()
+    batcher = DynamicBatcher(lambda items: [release.wait(timeout=5) for _ in items], 1, 0.0, max_pending=1)
+
+    pending = batcher.submit("a")
+    with pytest.raises(Full):
+        batcher.submit("b")
+    release.set()
+    assert pending.result(timeout=5) is True
+    assert batcher.submit("c").result(timeout=5) is True
@@ -0,0 +1,36 @@
+import numpy as np
+
+from face_index import ENCODING_DIMENSION, SEARCH_BLOCK_ROWS, FaceIndex
+
+
+def _gallery_with_nearest_in_later_block():
+    rows = SEARCH_BLOCK_ROWS * 3
+    rng = np.random.default_rng(7)
+    matrix = rng.normal(0.0, 0.1, size=(rows, ENCODING_DIMENSION)).astype(np.float32)
+    probe = rng.normal(0.0, 0.1, size=ENCODING_DIMENSION).astype(np.float32)
+    # A close but not nearest match in the first block, the true nearest in the last one.
+    matrix[3] = probe
+    matrix[3, 1] += 0.3
+    matrix[rows - 2] = probe
+    matrix[rows - 2, 1] += 0.1
+    return matrix, np.arange(100, 100 + rows, dtype=np.int64), probe, rows
+
+
+def test_search_returns_nearest_neighbour_from_a_later_block():
+    matrix, student_ids, probe, rows = _gallery_with_nearest_in_later_block()
+    index = FaceIndex(matrix, student_ids)
+
+    best_ids, best_distances = index.search([probe])
+    assert best_ids[0] == student_ids[rows - 2]
+    assert np.isclose(best_distances[0], 0.1, atol=1e-3)
+
+    block_indices, _ = index._search_blocks(probe[None, :])
+    assert block_indices[0] == rows - 2
+
+
+def test_strong_match_early_exit_is_opt_in():
+    matrix, student_ids, probe, _ = _gallery_with_nearest_in_later_block()
+    index = FaceIndex(matrix, student_ids, strong_match_distance=0.35)
+
+    block_indices, _ = index._search_blocks(probe[None, :])
+    assert block_indices[0] == 3
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("face_recognition")
+
+from face_index import ENCODING_DIMENSION
+from recognition_service import RecognitionService
+from student_db import StudentDB
+
+
+@pytest.fixture
+def student_db(tmp_path):
+    return StudentDB(str(tmp_path / "students.jsonl"))
+
+
+def _service(student_db):
+    return RecognitionService(
+        student_db=student_db,
+        tolerance=0.6,
+        detection_model="hog",
+        encoding_model="small",
+        resize_scale=1.0,
+        use_grayscale=False,
+    )
+
+
+def _encoding(value):
+    return np.full(ENCODING_DIMENSION, value, dtype=np.float32)
+
+
+def test_index_follows_register_and_delete(student_db, tmp_path):
+    service = _service(student_db)
+    assert len(service._face_index) == 0
+
+    first = student_db.register_student("Asha", "R1", "CS", _encoding(0.1))
+    second = student_db.register_student("Ravi", "R2", "CS", _encoding(-0.1))
+    assert service.reload_known_faces() == 2
+    best_ids, _ = service._face_index.search([_encoding(-0.1)])
+    assert best_ids[0] == second["id"]
+
+    student_db.delete_student(second["id"])
+    assert service.reload_known_faces() == 1
+    best_ids, _ = service._face_index.search([_encoding(-0.1)])
+    assert best_ids[0] == first["id"]
+    assert not list(tmp_path.glob("encoding_cache"))
+
+
+def test_source_change_is_picked_up_without_explicit_reload(student_db):
+    service = _service(student_db)
+    other_db = StudentDB(student_db.json_path)
+    other_db.register_student("Asha", "R1", "CS", _encoding(0.1))
+
+    service._reload_if_source_changed()
+    assert len(service._face_index) == 1
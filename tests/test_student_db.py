@@ -0,0 +1,15 @@
+import numpy as np
+
+from student_db import StudentDB
+
+
+def test_get_student_by_id_returns_a_copy(tmp_path):
+    student_db = StudentDB(str(tmp_path / "students.jsonl"))
+    student = student_db.register_student("Asha", "R1", "CS", np.zeros(128, dtype=np.float32))
+
+    fetched = student_db.get_student_by_id(student["id"])
+    fetched["name"] = "Changed"
+
+    assert student_db.get_student_by_id(student["id"])["name"] == "Asha"
+    assert student_db.get_students(include_encoding=False)[0]["name"] == "Asha"
+    assert student_db.get_student_by_id(student["id"] + 1) is None
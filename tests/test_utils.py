@@ -0,0 +1,35 @@
+import json
+
+from utils import migrate_legacy_data_dir
+
+
+def _write_json(path, payload):
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def test_legacy_backend_data_is_copied_into_empty_data_dir(tmp_path):
+    legacy_dir = tmp_path / "backend" / "data"
+    data_dir = tmp_path / "data"
+    legacy_dir.mkdir(parents=True)
+    data_dir.mkdir()
+    _write_json(legacy_dir / "students.json", {"students": [{"id": 7}]})
+    _write_json(data_dir / "students.json", {"students": []})
+
+    assert migrate_legacy_data_dir(str(legacy_dir), str(data_dir), ["students.json", "attendance.json"], ["students.jsonl"])
+    assert json.loads((data_dir / "students.json").read_text(encoding="utf-8")) == {"students": [{"id": 7}]}
+    assert not (data_dir / "attendance.json").exists()
+    assert not legacy_dir.exists()
+    assert (tmp_path / "backend" / "data.migrated" / "students.json").exists()
+
+
+def test_legacy_backend_data_does_not_overwrite_live_data(tmp_path):
+    legacy_dir = tmp_path / "backend" / "data"
+    data_dir = tmp_path / "data"
+    legacy_dir.mkdir(parents=True)
+    data_dir.mkdir()
+    _write_json(legacy_dir / "students.json", {"students": [{"id": 7}]})
+    (data_dir / "students.jsonl").write_text("", encoding="utf-8")
+
+    assert not migrate_legacy_data_dir(str(legacy_dir), str(data_dir), ["students.json"], ["students.jsonl"])
+    assert not (data_dir / "students.json").exists()
+    assert legacy_dir.exists()
@@ -1,8 +1,101 @@
 import logging
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator
 
 
 def configure_logging(level: str) -> None:
     logging.basicConfig(
         level=level,
         format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-    )
\ No newline at end of file
+    )
+
+
+def strip_data_uri_prefix(encoded: str) -> str:
+    # Base64 never contains ",", so a comma near the start can only end a
+    # "data:image/...;base64," header. Only that bounded window is searched; headerless
+    # payloads are returned as-is, while stripping a header still copies the remainder.
+    comma = encoded.find(",", 0, 128)
+    return encoded[comma + 1:] if comma >= 0 else encoded
+
+
+def atomic_write(path: str, data: bytes, fsync: bool = True) -> None:
+    # Readers see either the old file or the new one, never a truncated write that the
+    # JSON stores would otherwise treat as empty and persist on their next save.
+    # A unique temp name per call, so two writers never interleave in one temp file.
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=f"{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def migrate_legacy_data_dir(legacy_dir: str, data_dir: str, file_names: Iterable[str], runtime_files: Iterable[str]) -> bool:
+    # Older run scripts started backend/app.py, whose live data sat in backend/data. The JSON
+    # files there are copied over the bundled ones in data/ before data/ builds its own stores,
+    # so the one-time JSON imports pick them up. The old folder is renamed afterwards rather
+    # than deleted, which also keeps this from running twice.
+    if not os.path.isdir(legacy_dir):
+        return False
+    if any(os.path.exists(os.path.join(data_dir, name)) for name in runtime_files):
+        logging.warning("Legacy data in %s was not migrated: %s already has live data", legacy_dir, data_dir)
+        return False
+
+    os.makedirs(data_dir, exist_ok=True)
+    for name in file_names:
+        source = os.path.join(legacy_dir, name)
+        if os.path.isfile(source):
+            shutil.copy2(source, os.path.join(data_dir, name))
+    os.replace(legacy_dir, f"{legacy_dir}.migrated")
+    logging.info("Migrated legacy data from %s to %s", legacy_dir, data_dir)
+    return True
+
+
+class ReadWriteLock:
+    # Many readers or one writer. Waiting writers block new readers so a steady stream of
+    # dashboard polls cannot starve attendance or password writes.
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read_lock(self) -> Iterator[None]:
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write_lock(self) -> Iterator[None]:
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()